@@ -11,26 +11,42 @@ Requirements:
 - discopy 
 - pytket
 - pytket-qiskit
+- jax
 - numpy
+- opt_einsum
 - matplotlib
+- numba (optional, compiles the contraction kernel)
+- pytket-cutensornet (optional, GPU statevector simulation)
 """
 
 import numpy as np
+import opt_einsum as oe
 from typing import List, Dict, Tuple, Optional
 import matplotlib.pyplot as plt
 
+try:
+    import numba
+except ImportError:  # numba is optional; opt_einsum handles the contraction without it
+    numba = None
+
+try:
+    from pytket.extensions.cutensornet import CuTensorNetStateBackend
+except ImportError:  # no GPU tensor-network backend; circuits run on the CPU model
+    CuTensorNetStateBackend = None
+
 from lambeq import (
     BobcatParser,
     AtomicType,
-    IQPAnsatz,
     SpiderAnsatz,
-    TketModel,
+    NumpyModel,
     discopy
 )
 
 from discopy.grammar.pregroup import Word, Cup, Swap, Id, Diagram, Ty
 from discopy.quantum import Circuit, Box, Measure, CX, H, Ket, Bra
 
+from lot_in_life_common import PARAM_RNG, iqp_circuit
+
 # Define atomic types
 n = AtomicType.NOUN       # Noun type
 s = AtomicType.SENTENCE   # Sentence type
@@ -78,17 +94,22 @@ def create_pregroup_diagram():
 def analyze_tensor_structure(diagram: Diagram):
     """Analyze the tensor structure of the diagram"""
     
-    # Extract word boxes
-    words = [box for box in diagram.boxes if isinstance(box, Word)]
-    
-    # Extract cups (contractions)
-    cups = [box for box in diagram.boxes if isinstance(box, Cup)]
+    # Collect word boxes and cups (contractions) in a single pass
+    names = []
+    word_types = []
+    connections = []
+    for box in diagram.boxes:
+        if isinstance(box, Word):
+            names.append(box.name)
+            word_types.append(str(box.cod))
+        elif isinstance(box, Cup):
+            connections.append((box.dom[0].name, box.dom[1].name))
     
     analysis = {
-        "words": [word.name for word in words],
-        "word_types": [str(word.cod) for word in words],
-        "connections": [(cup.dom[0].name, cup.dom[1].name) for cup in cups],
-        "tensor_dimensions": len(cups) + 1  # Dimensionality of the tensor network
+        "words": names,
+        "word_types": word_types,
+        "connections": connections,
+        "tensor_dimensions": len(connections) + 1  # Dimensionality of the tensor network
     }
     
     return analysis
@@ -100,19 +121,20 @@ def create_concrete_meanings():
     dim_n = 2  # Dimension for noun space
     dim_s = 2  # Dimension for sentence space
     
-    # Create concrete tensors for each word
-    meanings = {
+    # Create concrete tensors for each word; the hand-picked values need
+    # nothing like float64 precision, so single precision halves the traffic
+    values = {
         # someone's: n⊗n^r (2x2 matrix)
         "someone's": np.array([
             [0.7, 0.3],  # Individual identity component
             [0.3, 0.3]   # Possessive relationship component
-        ]),
+        ], dtype=np.float32),
         
         # lot: n (2D vector)
         "lot": np.array([
             0.5,  # Determination component 
             0.5   # Randomness/fate component
-        ]),
+        ], dtype=np.float32),
         
         # in: n⊗n^r⊗s^l⊗s (2x2x2x2 tensor) - simplified
         "in": np.array([
@@ -120,25 +142,33 @@ def create_concrete_meanings():
              [[0.1, 0.1], [0.2, 0.1]]],
             [[[0.1, 0.1], [0.2, 0.1]],
              [[0.1, 0.0], [0.1, 0.1]]]
-        ]),
+        ], dtype=np.float32),
         
         # life: n (2D vector)
         "life": np.array([
             0.6,  # Temporal component
             0.4   # Experience component
-        ])
+        ], dtype=np.float32)
     }
     
+    # Pack every word tensor into one contiguous buffer and hand out views,
+    # so the contractions never need a hidden copy for contiguity
+    buf = np.empty(sum(value.size for value in values.values()), dtype=np.float32)
+    meanings = {}
+    offset = 0
+    for word, value in values.items():
+        view = buf[offset:offset + value.size].reshape(value.shape)
+        view[...] = value
+        meanings[word] = view
+        offset += value.size
+    
     return meanings
 
 def quantum_circuit_representation(diagram: Diagram):
     """Create a quantum circuit representation using IQP ansatz"""
     
-    # Define the ansatz for circuit creation
-    ansatz = IQPAnsatz({AtomicType.NOUN: 1, AtomicType.SENTENCE: 1})
-    
-    # Convert diagram to quantum circuit
-    circuit = ansatz(diagram)
+    # Convert diagram to quantum circuit (cached across calls)
+    circuit, _ = iqp_circuit(diagram)
     
     # Extract circuit information
     info = {
@@ -150,31 +180,123 @@ def quantum_circuit_representation(diagram: Diagram):
     
     return info
 
-def normalize_meanings(meanings, diagram):
-    """Perform manual normalization of meanings according to diagram structure"""
-    
-    # This is a simplified calculation that follows the tensor contraction
-    # in the pregroup diagram, but doesn't fully implement all steps
-    
-    # First contraction: someone's ⊗ lot
-    someone_s_lot = np.outer(meanings["someone's"][0], meanings["lot"])
-    
-    # Second contraction: in ⊗ life
-    in_life = np.tensordot(
-        meanings["in"], 
-        meanings["life"],
-        axes=0
-    )
+_GPU_BACKEND = None
+
+def _get_gpu_backend():
+    """Return the shared cuTensorNet backend, creating it on first use."""
+    global _GPU_BACKEND
+    if _GPU_BACKEND is None:
+        _GPU_BACKEND = CuTensorNetStateBackend()
+    return _GPU_BACKEND
+
+def simulate_state(circuit, model, params):
+    """Evaluate the circuit for the given parameters, on GPU when cuTensorNet is available"""
     
-    # Final contraction approximation
-    result = np.tensordot(someone_s_lot.flatten(), in_life.reshape(-1), axes=0)
+    if CuTensorNetStateBackend is not None:
+        # Bind the symbols and convert to a pytket circuit
+        concrete = circuit.lambdify(*model.symbols)(*params)
+        tk_circuit = concrete.to_tk()
+        
+        # A statevector ignores post-selection, so circuits that still post-select
+        # qubits go through the CPU model to keep both paths returning the same output
+        if not tk_circuit.post_selection:
+            backend = _get_gpu_backend()
+            compiled = backend.get_compiled_circuit(tk_circuit)
+            state = backend.run_circuit(compiled).get_state()
+            
+            # Match the CPU model: normalised outcome probabilities, one axis per qubit
+            probs = np.abs(state) ** 2
+            return (probs / probs.sum()).reshape((2,) * circuit.n_qubits)
+    
+    # CPU fallback through the compiled NumpyModel
+    model.weights = params
+    return model.get_diagram_output([circuit])[0]
+
+# Cup structure of the diagram as a single contraction:
+#   someone's (n⊗n^r) · lot (n)   -> n^r meets the noun 'lot'
+#   in (n⊗n^r⊗s^l⊗s) · life (n)   -> n^r meets the noun 'life'
+#   "someone's lot" fills the n wire of 'in', leaving s^l⊗s open
+NORMALIZE_EQUATION = "ij,j,ibcd,b->cd"
+NORMALIZE_SHAPES = [(2, 2), (2,), (2, 2, 2, 2), (2,)]
+
+# The shapes are fixed, so the contraction is compiled once at import and
+# every call goes straight to the precomputed sequence of BLAS calls. The
+# dynamic-programming optimizer finds the true optimum for a handful of
+# tensors while respecting the memory cap on intermediates.
+NORMALIZE_EXPRESSION = oe.contract_expression(
+    NORMALIZE_EQUATION, *NORMALIZE_SHAPES,
+    optimize='dp', memory_limit=10**6
+)
+
+def _specialize_contract(dim_n: int, dim_s: int):
+    """Generate an unrolled kernel contracting the word tensors along NORMALIZE_EQUATION"""
+    lines = ["def _contract(someones, lot, in_t, life):"]
+    
+    # someone's · lot
+    for i in range(dim_n):
+        terms = " + ".join(f"someones[{i}, {j}] * lot[{j}]" for j in range(dim_n))
+        lines.append(f"    p{i} = {terms}")
+    
+    # (someone's lot) · in · life
+    for i in range(dim_n):
+        for b in range(dim_n):
+            lines.append(f"    w{i}_{b} = p{i} * life[{b}]")
+    lines.append(f"    result = np.empty(({dim_s}, {dim_s}), dtype=lot.dtype)")
+    for c in range(dim_s):
+        for d in range(dim_s):
+            terms = " + ".join(
+                f"w{i}_{b} * in_t[{i}, {b}, {c}, {d}]"
+                for i in range(dim_n) for b in range(dim_n)
+            )
+            lines.append(f"    result[{c}, {d}] = {terms}")
     
     # Normalize to get probability-like value
-    result_normalized = np.abs(result) / np.sum(np.abs(result))
+    total = " + ".join(f"abs(result[{c}, {d}])" for c in range(dim_s) for d in range(dim_s))
+    lines.append(f"    total = {total}")
+    lines.append("    result_normalized = np.empty_like(result)")
+    for c in range(dim_s):
+        for d in range(dim_s):
+            lines.append(f"    result_normalized[{c}, {d}] = abs(result[{c}, {d}]) / total")
+    lines.append("    return result, result_normalized")
+    
+    namespace = {"np": np}
+    exec("\n".join(lines), namespace)
+    return namespace["_contract"]
+
+# The dimensions are fixed, so the kernel is specialized once at import
+_contract = _specialize_contract(NORMALIZE_SHAPES[1][0], NORMALIZE_SHAPES[2][3])
+
+if numba is not None:
+    # The word tensors are tiny, so NumPy's per-call dispatch dominates;
+    # compiling the unrolled kernel leaves a handful of FMAs. Generated code
+    # has no source file, so it cannot use Numba's on-disk cache.
+    _contract = numba.njit(fastmath=True)(_contract)
+
+def normalize_meanings(meanings, diagram):
+    """Perform manual normalization of meanings according to diagram structure"""
+    
+    if numba is not None:
+        result, result_normalized = _contract(
+            meanings["someone's"],
+            meanings["lot"],
+            meanings["in"],
+            meanings["life"]
+        )
+    else:
+        # One contraction over all word tensors, dispatched pairwise to BLAS
+        # instead of building the full outer product of every word
+        result = NORMALIZE_EXPRESSION(
+            meanings["someone's"],
+            meanings["lot"],
+            meanings["in"],
+            meanings["life"]
+        )
+        
+        # Normalize to get probability-like value, reusing the one |result| buffer
+        result_normalized = np.abs(result)
+        result_normalized /= result_normalized.sum()
     
     return {
-        "someone_s_lot": someone_s_lot,
-        "in_life": in_life,
         "result_full": result,
         "result_normalized": result_normalized
     }
@@ -221,11 +343,14 @@ def main():
     # Perform normalization
     normalization = normalize_meanings(meanings, diagram)
     
-    print("\nIntermediate tensor products:")
-    print("  'someone's lot':")
-    print(normalization["someone_s_lot"])
-    print("\n  'in life':")
-    print(normalization["in_life"].shape) # Too large to print fully
+    print("\nContraction following the cup structure:")
+    print(f"  {NORMALIZE_EQUATION}")
+    
+    # The intermediates only exist inside the compiled expression, so list
+    # its pairwise steps rather than materializing tensors just to show them
+    print("  with pairwise steps:")
+    for step in NORMALIZE_EXPRESSION.contraction_list:
+        print(f"    {step[2]}")
     
     print("\nFinal normalized meaning:")
     print(normalization["result_normalized"])
@@ -246,19 +371,22 @@ def main():
     print("\n4. Quantum Normalization Process")
     print("------------------------------")
     
-    # Create concrete quantum model
-    ansatz = IQPAnsatz({AtomicType.NOUN: 1, AtomicType.SENTENCE: 1})
-    circuit = ansatz(diagram)
-    model = TketModel.from_diagrams([circuit])
+    # Create concrete quantum model; the JAX-jitted NumpyModel compiles the
+    # circuit contraction once and reuses it for every parameter evaluation
+    circuit, _ = iqp_circuit(diagram)
+    model = NumpyModel.from_diagrams([circuit], use_jit=True)
     
     # Initialize random parameters
     n_params = len(model.symbols)
-    params = 2 * np.pi * np.random.rand(n_params)
+    params = PARAM_RNG.uniform(0, 2 * np.pi, size=n_params)
     
     print(f"Model has {n_params} parameters")
     print("\nParameter initialization:")
     print(params)
     
+    print("\nCircuit output:")
+    print(simulate_state(circuit, model, params))
+    
     print("\nQuantum normalization as projection:")
     print("  |ψ⟩ = U(θ)|0⟩^⊗n")
     print("  Probability of meaning = |⟨1|ψ⟩|²")
@@ -12,9 +12,16 @@ Requirements:
 - pytket
 - pytket-qiskit
 - matplotlib
+- jax
 - numpy
 """
 
+import functools
+import hashlib
+import os
+import pickle
+
+import lambeq
 import numpy as np
 import matplotlib.pyplot as plt
 from typing import List, Dict, Tuple
@@ -22,9 +29,7 @@ from typing import List, Dict, Tuple
 # Import lambeq components for categorical quantum NLP
 from lambeq import (
     BobcatParser,
-    AtomicType,
-    IQPAnsatz,
-    TketModel,
+    NumpyModel,
     SpiderAnsatz,
     discopy,
     remove_cups,
@@ -33,6 +38,54 @@ from lambeq import (
 
 from discopy.quantum import Circuit, Id, Box, Tensor, Swap, Ket, Bra, sqrt, H, X, Z, CX, Measure
 
+from lot_in_life_common import PARAM_RNG, iqp_circuit
+
+# Parsed diagrams are pickled here so later runs can skip loading the parser
+DIAGRAM_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "lambeq_diagrams")
+
+_PARSER = None
+
+def _get_parser():
+    """Return the shared BobcatParser, loading the CCG model on first use."""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = BobcatParser(verbose='text')
+    return _PARSER
+
+@functools.lru_cache(maxsize=128)
+def _parse(sentence: str):
+    """Parse a sentence into a diagram, memoized in memory and on disk."""
+    # Pickles from another lambeq release may not load, so the version is
+    # part of the key
+    key = hashlib.sha1(f"{lambeq.__version__}:{sentence}".encode("utf-8")).hexdigest()
+    cache_path = os.path.join(DIAGRAM_CACHE_DIR, f"{key}.pkl")
+    
+    # A truncated or stale pickle is treated as a cache miss
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+    
+    diagram = _get_parser().sentence2diagram(sentence)
+    
+    # The disk cache is only an optimization; a failed write is not an error.
+    # Dump to a temporary file and move it into place so an interrupted run
+    # never leaves a partial pickle behind.
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(DIAGRAM_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(diagram, f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, pickle.PicklingError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    
+    return diagram
+
 def main():
     """Main execution function demonstrating categorical quantum linguistics 
     representation of 'someone's lot in life'."""
@@ -45,11 +98,8 @@ def main():
     
     sentence = "someone's lot in life"
     
-    # Initialize the parser - Bobcat is lambeq's CCG parser
-    parser = BobcatParser(verbose='text')
-    
-    # Parse the sentence
-    diagram = parser.sentence2diagram(sentence)
+    # Parse the sentence with lambeq's Bobcat CCG parser (cached across calls)
+    diagram = _parse(sentence)
     
     # Display the pregroup types
     print(f"Sentence: '{sentence}'")
@@ -85,11 +135,8 @@ def main():
     print("\n3. Quantum Circuit Translation")
     print("----------------------------")
     
-    # Define ansatz for mapping to quantum circuit
-    ansatz = IQPAnsatz({AtomicType.NOUN: 1, AtomicType.SENTENCE: 1})
-    
-    # Create the circuit
-    circuit = ansatz(diagram)
+    # Map the diagram to a quantum circuit with the IQP ansatz
+    circuit, _ = iqp_circuit(diagram)
     
     print("Quantum circuit representation:")
     print(circuit)
@@ -110,10 +157,10 @@ def main():
     # Define concrete meanings (density matrices) for each word
     # These would typically come from training, but we'll define them explicitly
     word_matrices = {
-        "someone's": np.array([[0.7, 0.2], [0.2, 0.3]]),  # Possessive: uncertainty, dependency
-        "lot": np.array([[0.5, 0.5], [0.5, 0.5]]),        # Lot: equal possibilities
-        "in": np.array([[0.9, 0.1], [0.1, 0.1]]),         # In: strong contextual binding
-        "life": np.array([[0.4, 0.6], [0.6, 0.6]])        # Life: existential space
+        "someone's": np.array([[0.7, 0.2], [0.2, 0.3]], dtype=np.float32),  # Possessive: uncertainty, dependency
+        "lot": np.array([[0.5, 0.5], [0.5, 0.5]], dtype=np.float32),        # Lot: equal possibilities
+        "in": np.array([[0.9, 0.1], [0.1, 0.1]], dtype=np.float32),         # In: strong contextual binding
+        "life": np.array([[0.4, 0.6], [0.6, 0.6]], dtype=np.float32)        # Life: existential space
     }
     
     print("Word representations as density matrices:")
@@ -127,31 +174,30 @@ def main():
     print("2. For cups (e.g., n⊗n^r → I), we contract indices")
     print("3. For composition, we use tensor product followed by contraction")
     
-    # Simplified normalization calculation
+    # Normalization by contracting one cup at a time: each cup joins the
+    # right wire of a word to the left wire of the next word
     print("\nSimplified normalization result:")
-    combined = np.tensordot(
-        np.tensordot(word_matrices["someone's"], word_matrices["lot"], axes=0),
-        np.tensordot(word_matrices["in"], word_matrices["life"], axes=0),
-        axes=0
-    )
-    # This is a highly simplified contraction - real implementation would follow the cup/cap structure
+    someones_lot = np.tensordot(word_matrices["someone's"], word_matrices["lot"], axes=([1], [0]))
+    in_life = np.tensordot(word_matrices["in"], word_matrices["life"], axes=([1], [0]))
+    combined = np.tensordot(someones_lot, in_life, axes=([1], [0]))
     
     # Show result shape and a normalized result
     print(f"Result tensor shape: {combined.shape}")
-    print("Normalized to scalar by contracting along appropriate dimensions")
-    final_result = np.trace(np.sum(combined, axis=(1, 3, 5)))
+    print("Normalized to scalar by closing the remaining pair of wires")
+    final_result = np.trace(combined)
     print(f"Final scalar: {final_result}")
     
-    # Create a concrete TketModel for execution
+    # Create a concrete model for execution; NumpyModel with use_jit=True
+    # evaluates the circuit through a JAX-compiled tensor contraction
     print("\nCreating executable quantum model:")
-    model = TketModel.from_diagrams([circuit])
+    model = NumpyModel.from_diagrams([circuit], use_jit=True)
     
     print("\nModel parameters:")
     print(f"- Circuit parameters: {model.symbols}")
     print(f"- Parameter count: {len(model.symbols)}")
     
     # Initialize with random parameters
-    params = 2 * np.pi * np.random.rand(len(model.symbols))
+    params = PARAM_RNG.uniform(0, 2 * np.pi, size=len(model.symbols))
     print("\nRandom initialization of circuit parameters:")
     print(params)
     
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+"""
+Shared helpers for the "someone's lot in life" examples
+=======================================================
+
+Circuit construction and parameter initialization used by more than one
+example script, kept in one place so the scripts stay consistent.
+
+Requirements:
+- lambeq
+- numpy
+"""
+
+import numpy as np
+
+from lambeq import AtomicType, IQPAnsatz, remove_cups
+
+# Shared random generator for circuit parameter initialization
+PARAM_RNG = np.random.default_rng(0)
+
+# Circuits produced by the IQP ansatz, keyed by diagram and qubit counts
+_CIRCUIT_CACHE = {}
+
+def iqp_circuit(diagram, n_noun: int = 1, n_sent: int = 1):
+    """Apply the IQP ansatz once per diagram and return (circuit, symbols)."""
+    key = (str(diagram), n_noun, n_sent)
+    if key not in _CIRCUIT_CACHE:
+        ansatz = IQPAnsatz({AtomicType.NOUN: n_noun, AtomicType.SENTENCE: n_sent})
+
+        # Remove cups first so they do not turn into extra qubits and
+        # post-selections
+        circuit = ansatz(remove_cups(diagram))
+        _CIRCUIT_CACHE[key] = (circuit, tuple(circuit.free_symbols))
+    return _CIRCUIT_CACHE[key]
@@ -19,28 +19,48 @@ Requirements:
 - pytket-qiskit 
 - qiskit
 - numpy
-- matplotlib
+- opt_einsum
+- numba (optional, compiles the circuit drawing kernel)
+- jax (optional, enables the vectorized 'jax' simulation backend)
 """
 
+import functools
+import io
+import sys
+
 import numpy as np
-import matplotlib.pyplot as plt
+import opt_einsum as oe
+from types import MappingProxyType
 from typing import List, Dict, Tuple, Optional
 
+try:
+    import numba
+except ImportError:  # numba is optional; the drawing kernel then runs as plain Python
+    numba = None
+
+try:
+    import jax
+    import jax.numpy as jnp
+except ImportError:  # jax is optional; only the 'jax' backend needs it
+    jax = None
+
 # Import lambeq and DisCoPy components
 from lambeq import (
     BobcatParser,
     AtomicType,
     IQPAnsatz,
     SpiderAnsatz,
-    TketModel,
     discopy,
     remove_cups
 )
 
 from discopy import Diagram as DiscopyDiagram
 from discopy.grammar.pregroup import Word, Cup, Diagram, Box, Ty, Id
+from discopy.tensor import backend as tensor_backend
 from discopy.quantum import Circuit, qubit, Ket, Bra, CX, H, X, Y, Z, S, T, SWAP, scalar, Measure
 
+from lot_in_life_common import PARAM_RNG
+
 # Define atomic types for pregroup grammar
 n = AtomicType.NOUN         # noun
 s = AtomicType.SENTENCE     # sentence
@@ -51,158 +71,305 @@ n_l = n.l                   # left adjoint of noun
 s_r = s.r                   # right adjoint of sentence
 s_l = s.l                   # left adjoint of sentence
 
+# Word tensors contracted along the pregroup cups:
+#   someone's (n⊗n^r) · lot (n)   -> n^r meets the noun 'lot'
+#   in (n⊗n^r⊗s^l⊗s) · life (n)   -> n^r meets the noun 'life'
+#   "someone's lot" fills the n wire of 'in', leaving s^l⊗s open
+TENSOR_NETWORK_EQUATION = "ij,j,ibcd,b->cd"
+
+DEFAULT_SENTENCE = "someone's lot in life"
+
+# Interpretations of the two-qubit outcomes, indexed by int(bitstring, 2)
+_INTERPRETATIONS = (
+    "Fate is entirely predetermined",               # 00
+    "Fate is predetermined but can be influenced",  # 01
+    "Life has randomness but follows patterns",     # 10
+    "Life is completely open-ended"                 # 11
+)
+
+# Illustrative distribution returned by the 'mock' backend, frozen so the
+# same arrays and mapping are handed out on every call
+_MOCK_BITSTRINGS = ('00', '01', '10', '11')
+_MOCK_RESULTS = np.array([0.25, 0.15, 0.35, 0.25], dtype=np.float32)
+_MOCK_RESULTS.flags.writeable = False
+_MOCK_RESULT_MAP = MappingProxyType(
+    dict(zip(_MOCK_BITSTRINGS, _MOCK_RESULTS.astype(float).round(6).tolist()))
+)
+
+# The grammar is static, so word types, word boxes and cup layers are
+# built once at import rather than per QuantumSemantics instance
+_WORD_TYPES = {
+    "someone's": n @ n_r,         # Possessive: n⊗n^r
+    "lot": n,                     # Noun: n
+    "in": n @ n_r @ s_l @ s,      # Preposition: n⊗n^r⊗s^l⊗s
+    "life": n                     # Noun: n
+}
+
+_WORD_BOXES = [Word(word, word_type) for word, word_type in _WORD_TYPES.items()]
+
+_CUP_LAYERS = [
+    Id(n) @ Cup(n_r, n) @ Id(n @ n_r @ s_l @ s @ n),  # First layer of cups
+    Id(n) @ Cup(n_r, n) @ Id(s_l @ s @ n),            # Second layer of cups
+    Id(n) @ Cup(s_l, s) @ Id(n),                      # Third layer of cups
+    Cup(n, n_r)                                       # Final cup
+]
+
+# Concrete word meanings in the computational basis (2D representations for
+# simplicity), stored as one read-only float32 array built by a single
+# np.asarray call; each word is a view at its (offset, shape)
+_WORD_DATA = np.asarray([
+    # someone's: n⊗n^r (2x2 matrix)
+    0.7, 0.3,    # 70% identity, 30% relation
+    0.3, 0.3,    # 30% dependency, 30% uncertainty
+    # lot: n (2D vector)
+    0.6, 0.4,    # 60% destiny, 40% chance
+    # in: n⊗n^r⊗s^l⊗s (2x2x2x2 tensor) - abstracted for simplicity
+    0.3, 0.1, 0.1, 0.0,
+    0.1, 0.2, 0.0, 0.1,
+    0.1, 0.0, 0.2, 0.1,
+    0.0, 0.1, 0.1, 0.3,
+    # life: n (2D vector)
+    0.5, 0.5,    # 50% temporal, 50% experience
+], dtype=np.float32)
+_WORD_DATA.flags.writeable = False
+
+_WORD_LAYOUT = {
+    "someone's": (0, (2, 2)),
+    "lot": (4, (2,)),
+    "in": (6, (2, 2, 2, 2)),
+    "life": (22, (2,)),
+}
+
+_WORD_MATRICES = {
+    word: _WORD_DATA[offset:offset + int(np.prod(shape))].reshape(shape)
+    for word, (offset, shape) in _WORD_LAYOUT.items()
+}
+
+# The contraction path is compiled once at import with the fixed 'in' and
+# 'life' tensors as constants, so their contraction is precomputed and each
+# evaluation only supplies the "someone's" and "lot" operands
+_NETWORK_EXPRESSION = oe.contract_expression(
+    TENSOR_NETWORK_EQUATION,
+    _WORD_MATRICES["someone's"].shape,
+    _WORD_MATRICES["lot"].shape,
+    _WORD_MATRICES["in"],
+    _WORD_MATRICES["life"],
+    constants=[2, 3],
+    optimize='greedy'
+)
+
 class QuantumSemantics:
     """A class for implementing quantum categorical semantics."""
     
-    def __init__(self, sentence: str = "someone's lot in life"):
+    # Ansatz objects hold no per-sentence state, so one per type is shared
+    _ANSATZ_CACHE = {}
+    
+    # The Bobcat model is large, so it is loaded at most once per process
+    _PARSER = None
+    
+    def __init__(self, sentence: str = DEFAULT_SENTENCE):
         """Initialize with the target sentence."""
         self.sentence = sentence
         self.words = sentence.split()
-        self.parser = BobcatParser(verbose='text')
         self.word_types = self._define_word_types()
         self.diagrams = {}
         self.circuits = {}
         self.measurements = {}
+        self.network_value = None
+        
+        # Jitted batch evaluators, compiled once per ansatz type
+        self._jax_evaluators = {}
         
+    @classmethod
+    def _get_parser(cls):
+        """Return the shared BobcatParser, loading it on first use."""
+        if cls._PARSER is None:
+            cls._PARSER = BobcatParser(verbose='text')
+        return cls._PARSER
+    
     def _define_word_types(self) -> Dict[str, Ty]:
         """Define the pregroup types for each word."""
-        return {
-            "someone's": n @ n_r,         # Possessive: n⊗n^r
-            "lot": n,                     # Noun: n
-            "in": n @ n_r @ s_l @ s,      # Preposition: n⊗n^r⊗s^l⊗s
-            "life": n                     # Noun: n
-        }
+        return _WORD_TYPES
     
     def create_pregroup_diagram(self) -> Diagram:
         """Create the pregroup diagram by hand."""
+        if 'pregroup' in self.diagrams:
+            return self.diagrams['pregroup']
         
-        # Create word boxes
-        someone_s = Word("someone's", self.word_types["someone's"])
-        lot = Word("lot", self.word_types["lot"])
-        in_prep = Word("in", self.word_types["in"])
-        life = Word("life", self.word_types["life"])
-        
-        # Combine words
-        words = someone_s @ lot @ in_prep @ life
-        
-        # Apply cups for grammatical reductions
-        # First layer of cups
-        first_cups = Id(n) @ Cup(n_r, n) @ Id(n @ n_r @ s_l @ s @ n)
-        # Second layer of cups
-        second_cups = Id(n) @ Cup(n_r, n) @ Id(s_l @ s @ n)
-        # Third layer of cups
-        third_cups = Id(n) @ Cup(s_l, s) @ Id(n)
-        # Final cup
-        final_cup = Cup(n, n_r)
+        # Combine the prebuilt word boxes
+        someone_s, lot, in_prep, life = _WORD_BOXES
+        diagram = someone_s @ lot @ in_prep @ life
         
         # Apply all reductions
-        diagram = words >> first_cups >> second_cups >> third_cups >> final_cup
+        for cups in _CUP_LAYERS:
+            diagram = diagram >> cups
         
         self.diagrams['pregroup'] = diagram
         return diagram
     
     def automatic_parsing(self) -> Diagram:
         """Parse the sentence using lambeq's automated parser."""
-        auto_diagram = self.parser.sentence2diagram(self.sentence)
+        if 'auto' in self.diagrams:
+            return self.diagrams['auto']
+        
+        auto_diagram = self._get_parser().sentence2diagram(self.sentence)
         self.diagrams['auto'] = auto_diagram
         return auto_diagram
     
     def create_tensor_network(self) -> DiscopyDiagram:
         """Create tensor network representation from the pregroup diagram."""
-        if 'pregroup' not in self.diagrams:
-            self.create_pregroup_diagram()
-            
+        if 'tensor' in self.diagrams:
+            return self.diagrams['tensor']
+        
         # Convert the pregroup diagram to a tensor network
-        tensor_diagram = self.diagrams['pregroup'].to_tensor()
+        tensor_diagram = self.create_pregroup_diagram().to_tensor()
         self.diagrams['tensor'] = tensor_diagram
+        
+        # Evaluate the network on the concrete word tensors; 'in' and 'life'
+        # are already folded into the compiled expression
+        word_matrices = self.define_word_matrices()
+        self.network_value = _NETWORK_EXPRESSION(word_matrices["someone's"], word_matrices["lot"])
+        
         return tensor_diagram
     
+    @classmethod
+    def _get_ansatz(cls, ansatz_type: str):
+        """Return the shared ansatz for a type, constructing it on first use."""
+        if ansatz_type not in cls._ANSATZ_CACHE:
+            if ansatz_type == 'IQP':
+                # IQP ansatz with dimensional specifications
+                ansatz = IQPAnsatz({AtomicType.NOUN: 1, AtomicType.SENTENCE: 1})
+            elif ansatz_type == 'spider':
+                # Spider ansatz - alternative circuit structure
+                ansatz = SpiderAnsatz({AtomicType.NOUN: 1, AtomicType.SENTENCE: 1})
+            else:
+                raise ValueError(f"Unknown ansatz type: {ansatz_type}")
+            cls._ANSATZ_CACHE[ansatz_type] = ansatz
+        return cls._ANSATZ_CACHE[ansatz_type]
+    
     def create_quantum_circuit(self, ansatz_type: str = 'IQP') -> Circuit:
         """Create quantum circuit from the pregroup diagram."""
+        if ansatz_type in self.circuits:
+            return self.circuits[ansatz_type]
+        
         if 'pregroup' not in self.diagrams:
             self.create_pregroup_diagram()
             
-        if ansatz_type == 'IQP':
-            # IQP ansatz with dimensional specifications
-            ansatz = IQPAnsatz({AtomicType.NOUN: 1, AtomicType.SENTENCE: 1})
-        elif ansatz_type == 'spider':
-            # Spider ansatz - alternative circuit structure
-            ansatz = SpiderAnsatz({AtomicType.NOUN: 1, AtomicType.SENTENCE: 1})
-        else:
-            raise ValueError(f"Unknown ansatz type: {ansatz_type}")
-            
         # Convert the diagram to a quantum circuit using the ansatz
-        circuit = ansatz(self.diagrams['pregroup'])
+        circuit = self._get_ansatz(ansatz_type)(self.diagrams['pregroup'])
         self.circuits[ansatz_type] = circuit
         return circuit
     
     def define_word_matrices(self):
         """Define concrete meaning matrices for each word."""
+        # Views into the shared module-level data; nothing is copied
+        return dict(_WORD_MATRICES)
+    
+    def simulate_quantum_circuit(self, n_shots: int = 1000, backend: str = 'mock', batch_size: int = 1):
+        """Simulate the quantum circuit with given parameters.
+        
+        backend='mock' returns fixed illustrative results; backend='numpy'
+        evaluates the circuit exactly for batch_size random parameter sets,
+        one set at a time, and backend='jax' evaluates the whole batch in one
+        jitted, vmapped XLA call.
+        """
+        if backend == 'mock':
+            # Mock measurement results - this would come from quantum simulation.
+            # Nothing consumes a model or parameters here, so none are built
+            params = None
+            results = _MOCK_RESULT_MAP
+        elif backend == 'numpy':
+            results, params = self._evaluate_circuit(self.create_quantum_circuit('IQP'), batch_size)
+        elif backend == 'jax':
+            results, params = self._evaluate_circuit_jax('IQP', batch_size)
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
         
-        # Define vector representations in the computational basis
-        # Using 2D representations for simplicity
-        
-        # someone's: n⊗n^r (2x2 matrix)
-        someone_s_matrix = np.array([
-            [0.7, 0.3],    # 70% identity, 30% relation
-            [0.3, 0.3]     # 30% dependency, 30% uncertainty
-        ])
-        
-        # lot: n (2D vector)
-        lot_vector = np.array([0.6, 0.4])  # 60% destiny, 40% chance
-        
-        # in: n⊗n^r⊗s^l⊗s (2x2x2x2 tensor) - abstracted for simplicity
-        # We'll use a simplified representation
-        in_tensor_flat = np.array([
-            0.3, 0.1, 0.1, 0.0,
-            0.1, 0.2, 0.0, 0.1,
-            0.1, 0.0, 0.2, 0.1,
-            0.0, 0.1, 0.1, 0.3
-        ]).reshape(2, 2, 2, 2)
-        
-        # life: n (2D vector)
-        life_vector = np.array([0.5, 0.5])  # 50% temporal, 50% experience
-        
-        word_meanings = {
-            "someone's": someone_s_matrix,
-            "lot": lot_vector,
-            "in": in_tensor_flat,
-            "life": life_vector
-        }
+        self.measurements['shots'] = n_shots
+        self.measurements['params'] = params
+        self.measurements['results'] = results
         
-        return word_meanings
+        return results
+    
+    @staticmethod
+    def _circuit_function(circuit: Circuit, symbols, xp=np):
+        """Return a pure params -> outcome probabilities function for the circuit.
+        
+        Built on the public lambdify API; xp is the array module (numpy or
+        jax.numpy) used for the final squaring and normalization.
+        """
+        lambdified = circuit.lambdify(*symbols)
+        
+        def _apply_circuit(params):
+            concrete = lambdified(*params)
+            result = concrete.eval().array
+            # Pure circuits give amplitudes, mixed ones probabilities already
+            if not concrete.is_mixed:
+                result = xp.abs(result) ** 2
+            return xp.ravel(result) / xp.sum(result)
+        
+        return _apply_circuit
+    
+    def _evaluate_circuit(self, circuit: Circuit, batch_size: int):
+        """Compute exact outcome probabilities for random parameter sets, one set at a time."""
+        symbols = tuple(circuit.free_symbols)
+        
+        # One (batch, n_params) draw covers the whole parameter sweep
+        params = PARAM_RNG.uniform(0, np.pi, size=(batch_size, len(symbols)))
+        
+        # Probabilities come straight from the evaluated state rather than
+        # from sampling shots, which is exact and cheap for a few qubits.
+        # Without jax there is no batched evaluator, so rows are evaluated
+        # in turn (backend='jax' does the whole batch at once)
+        apply_circuit = self._circuit_function(circuit, symbols)
+        probabilities = np.stack([apply_circuit(row) for row in params])
+        
+        # Report the distribution averaged over the sweep
+        mean = probabilities.mean(axis=0)
+        n_bits = max(1, int(np.log2(mean.size)))
+        results = {format(i, f'0{n_bits}b'): float(p) for i, p in enumerate(mean)}
+        
+        return results, params
     
-    def simulate_quantum_circuit(self, n_shots: int = 1000):
-        """Simulate the quantum circuit with given parameters."""
-        if not self.circuits:
-            self.create_quantum_circuit()
+    def _get_jax_evaluator(self, ansatz_type: str):
+        """Return (evaluate, symbols) for an ansatz type, jitting on first use.
+        
+        evaluate maps a (batch, n_params) array to outcome probabilities in one
+        XLA call; keeping it on the instance means later calls reuse the
+        compiled program instead of tracing the circuit again.
+        """
+        if ansatz_type not in self._jax_evaluators:
+            circuit = self.create_quantum_circuit(ansatz_type)
+            symbols = tuple(circuit.free_symbols)
             
-        circuit = self.circuits['IQP']
-        
-        # Create a model from the circuit
-        model = TketModel.from_diagrams([circuit])
+            # The pure per-row evaluator is traced with jax arrays, compiled once
+            # and vmapped over the batch axis, replacing the per-row Python loop
+            apply_circuit = self._circuit_function(circuit, symbols, xp=jnp)
+            
+            def _apply_circuit_jax(params):
+                with tensor_backend('jax'):
+                    return apply_circuit(params)
+            
+            self._jax_evaluators[ansatz_type] = (jax.jit(jax.vmap(_apply_circuit_jax)), symbols)
+        return self._jax_evaluators[ansatz_type]
+    
+    def _evaluate_circuit_jax(self, ansatz_type: str, batch_size: int):
+        """Compute outcome probabilities for the whole parameter batch with jax.jit + jax.vmap."""
+        if jax is None:
+            raise ImportError("backend='jax' requires jax to be installed")
         
-        # Initialize random parameters
-        n_params = len(model.symbols)
-        params = np.pi * np.random.rand(n_params)
+        evaluate, symbols = self._get_jax_evaluator(ansatz_type)
         
-        # For a real simulation, we would run:
-        # result = model.eval_batch([params], n_shots=n_shots)
-        # But for this example, we'll create mock results
+        # Randomness stays outside the traced function: the parameter batch
+        # is drawn up front and handed to XLA as a single array
+        params = PARAM_RNG.uniform(0, np.pi, size=(batch_size, len(symbols)))
+        probabilities = np.asarray(evaluate(jnp.asarray(params))).reshape(batch_size, -1)
         
-        # Mock measurement results - this would come from quantum simulation
-        mock_results = {
-            '00': 0.25,
-            '01': 0.15,
-            '10': 0.35,
-            '11': 0.25
-        }
+        mean = probabilities.mean(axis=0)
+        n_bits = max(1, int(np.log2(mean.size)))
+        results = {format(i, f'0{n_bits}b'): float(p) for i, p in enumerate(mean)}
         
-        self.measurements['shots'] = n_shots
-        self.measurements['params'] = params
-        self.measurements['results'] = mock_results
-        
-        return mock_results
+        return results, params
     
     def interpret_results(self):
         """Interpret the quantum measurement results."""
@@ -211,34 +378,37 @@ class QuantumSemantics:
             
         results = self.measurements['results']
         
-        # Interpret the bit strings
-        interpretations = {
-            '00': "Fate is entirely predetermined",
-            '01': "Fate is predetermined but can be influenced",
-            '10': "Life has randomness but follows patterns",
-            '11': "Life is completely open-ended"
-        }
+        # Sort outcomes by probability in a single argsort
+        bitstrings = list(results.keys())
+        probs = np.fromiter(results.values(), dtype=float, count=len(results))
+        order = np.argsort(-probs, kind='stable')
         
         # Create probability distribution of interpretations
         probabilities = []
-        for bit_string, prob in results.items():
+        for k in order:
+            bit_string = bitstrings[k]
+            if len(bit_string) == 2:
+                interpretation = _INTERPRETATIONS[int(bit_string, 2)]
+            else:
+                interpretation = f"Outcome |{bit_string}⟩"
             probabilities.append({
                 'bitstring': bit_string,
-                'probability': prob,
-                'interpretation': interpretations[bit_string]
+                'probability': float(probs[k]),
+                'interpretation': interpretation
             })
         
-        # Sort by probability
-        probabilities.sort(key=lambda x: x['probability'], reverse=True)
-        
         return probabilities
     
-    def full_analysis(self):
-        """Perform a full categorical quantum analysis of the phrase."""
+    def full_analysis(self, parse: bool = True):
+        """Perform a full categorical quantum analysis of the phrase.
+        
+        Every step is memoized on the instance, so repeated calls are cheap;
+        parse=False skips the automatic parse and the parser model load.
+        """
         
         # 1. Create pregroup diagram and auto-parsed diagram
         pregroup = self.create_pregroup_diagram()
-        auto = self.automatic_parsing()
+        auto = self.automatic_parsing() if parse else self.diagrams.get('auto')
         
         # 2. Create tensor network
         tensor = self.create_tensor_network()
@@ -251,7 +421,10 @@ class QuantumSemantics:
         word_matrices = self.define_word_matrices()
         
         # 5. Simulate quantum circuit
-        results = self.simulate_quantum_circuit(n_shots=1000)
+        if self.measurements:
+            results = self.measurements['results']
+        else:
+            results = self.simulate_quantum_circuit(n_shots=1000)
         
         # 6. Interpret results
         interpretations = self.interpret_results()
@@ -260,6 +433,7 @@ class QuantumSemantics:
             'pregroup': pregroup,
             'auto': auto,
             'tensor': tensor,
+            'network_value': self.network_value,
             'iqp_circuit': iqp_circuit,
             'spider_circuit': spider_circuit,
             'word_matrices': word_matrices,
@@ -270,96 +444,112 @@ class QuantumSemantics:
     def print_detailed_report(self):
         """Print a detailed report of the categorical quantum analysis."""
         
-        print("=== Categorical Quantum Semantics: 'Someone's Lot in Life' ===\n")
+        # Build everything once (without the automatic parse the report
+        # does not show) and render from the analysis results
+        analysis = self.full_analysis(parse=False)
+        
+        # Lines are collected in memory and written to stdout in one call
+        buf = io.StringIO()
+        write = functools.partial(print, file=buf)
+        
+        write("=== Categorical Quantum Semantics: 'Someone's Lot in Life' ===\n")
         
         # 1. Pregroup Grammar Typing
-        print("1. Pregroup Grammar Typing")
-        print("-------------------------")
-        print(f"Sentence: '{self.sentence}'")
-        print("\nTypes assigned by pregroup grammar:")
+        write("1. Pregroup Grammar Typing")
+        write("-------------------------")
+        write(f"Sentence: '{self.sentence}'")
+        write("\nTypes assigned by pregroup grammar:")
         
         for word, type_obj in self.word_types.items():
-            print(f"  - '{word}': {type_obj}")
+            write(f"  - '{word}': {type_obj}")
         
-        print("\nPregroup reduction:")
-        print("(n⊗n^r)⊗n⊗(n⊗n^r⊗s^l⊗s)⊗n → s")
+        write("\nPregroup reduction:")
+        write("(n⊗n^r)⊗n⊗(n⊗n^r⊗s^l⊗s)⊗n → s")
         
-        if not self.diagrams:
-            self.create_pregroup_diagram()
-        
-        print(f"\nPregroup diagram: {self.diagrams['pregroup']}")
+        write(f"\nPregroup diagram: {analysis['pregroup']}")
         
         # 2. Tensor Network Representation
-        print("\n2. Tensor Network Representation")
-        print("------------------------------")
-        
-        if 'tensor' not in self.diagrams:
-            self.create_tensor_network()
+        write("\n2. Tensor Network Representation")
+        write("------------------------------")
         
-        print(f"Tensor network: {self.diagrams['tensor']}")
+        write(f"Tensor network: {analysis['tensor']}")
+        write(f"\nContracted along {TENSOR_NETWORK_EQUATION}:")
+        write(analysis['network_value'])
         
         # 3. Quantum Circuit Translation
-        print("\n3. Quantum Circuit Translation")
-        print("----------------------------")
+        write("\n3. Quantum Circuit Translation")
+        write("----------------------------")
         
-        if not self.circuits:
-            self.create_quantum_circuit()
-            self.create_quantum_circuit('spider')
+        write("\nIQP Ansatz Circuit:")
+        write(analysis['iqp_circuit'])
         
-        print("\nIQP Ansatz Circuit:")
-        print(self.circuits['IQP'])
+        write("\nSpider Ansatz Circuit:")
+        write(analysis['spider_circuit'])
         
-        print("\nSpider Ansatz Circuit:")
-        print(self.circuits['spider'])
-        
-        print(f"\nCircuit width (qubits): {self.circuits['IQP'].n_qubits}")
-        print(f"Circuit depth (gates): {len(self.circuits['IQP'].data)}")
+        write(f"\nCircuit width (qubits): {analysis['iqp_circuit'].n_qubits}")
+        write(f"Circuit depth (gates): {len(analysis['iqp_circuit'].data)}")
         
         # 4. Word Matrices and Normalization
-        print("\n4. Word Matrices and Normalization")
-        print("---------------------------------")
+        write("\n4. Word Matrices and Normalization")
+        write("---------------------------------")
         
-        word_matrices = self.define_word_matrices()
-        
-        for word, matrix in word_matrices.items():
-            print(f"\n'{word}':")
-            print(matrix)
+        for word, matrix in analysis['word_matrices'].items():
+            write(f"\n'{word}':")
+            write(matrix)
         
         # 5. Quantum Simulation Results
-        print("\n5. Quantum Simulation Results")
-        print("---------------------------")
-        
-        if not self.measurements:
-            self.simulate_quantum_circuit()
+        write("\n5. Quantum Simulation Results")
+        write("---------------------------")
         
-        print(f"Circuit parameters: {self.measurements['params']}")
-        print(f"Number of shots: {self.measurements['shots']}")
+        params = self.measurements['params']
+        write(f"Circuit parameters: {'unbound (mock results)' if params is None else params}")
+        write(f"Number of shots: {self.measurements['shots']}")
         
-        print("\nMeasurement results:")
-        for bitstring, prob in self.measurements['results'].items():
-            print(f"  |{bitstring}⟩: {prob:.4f}")
+        write("\nMeasurement results:")
+        for bitstring, prob in analysis['results'].items():
+            write(f"  |{bitstring}⟩: {prob:.4f}")
         
         # 6. Semantic Interpretation
-        print("\n6. Semantic Interpretation")
-        print("------------------------")
+        write("\n6. Semantic Interpretation")
+        write("------------------------")
         
-        interpretations = self.interpret_results()
-        
-        print("Ranked interpretations of 'someone's lot in life':")
-        for i, interp in enumerate(interpretations, 1):
-            print(f"  {i}. {interp['interpretation']} ({interp['probability']:.2f})")
+        write("Ranked interpretations of 'someone's lot in life':")
+        for i, interp in enumerate(analysis['interpretations'], 1):
+            write(f"  {i}. {interp['interpretation']} ({interp['probability']:.2f})")
         
         # 7. Conclusion
-        print("\n7. Conclusion")
-        print("-----------")
-        print("This categorical quantum semantics representation demonstrates how")
-        print("the meaning of 'someone's lot in life' emerges from:")
-        print("  - The grammatical structure (pregroup types)")
-        print("  - The compositional nature (tensor contractions)")
-        print("  - The quantum representation (circuit)")
-        print("  - The probabilistic interpretation (measurements)")
-        print("\nThe final distribution of meaning across possible interpretations")
-        print("reflects the inherent ambiguity and richness of the phrase.")
+        write("\n7. Conclusion")
+        write("-----------")
+        write("This categorical quantum semantics representation demonstrates how")
+        write("the meaning of 'someone's lot in life' emerges from:")
+        write("  - The grammatical structure (pregroup types)")
+        write("  - The compositional nature (tensor contractions)")
+        write("  - The quantum representation (circuit)")
+        write("  - The probabilistic interpretation (measurements)")
+        write("\nThe final distribution of meaning across possible interpretations")
+        write("reflects the inherent ambiguity and richness of the phrase.")
+        
+        sys.stdout.write(buf.getvalue())
+
+
+# Gate names are mapped to small integer codes before entering the drawing kernel
+_GATE_CODES = {"H": 1, "X": 2, "Z": 3, "CX": 4, "SWAP": 5}
+_CX_CODE = 4
+
+# Symbol drawn for each gate code (code 0 is any other gate) and for a CX target
+_GATE_SYMBOLS = np.array([ord(symbol) for symbol in "UHXZ●×"], dtype=np.int32)
+_TARGET_SYMBOL = ord("X")
+
+def _draw_gates(grid, codes, w0, w1):
+    """Write the symbol of gate i into column i of a (qubits, depth) character grid."""
+    for i in range(codes.shape[0]):
+        if codes[i] == _CX_CODE:
+            grid[w1[i], i] = _TARGET_SYMBOL
+        if codes[i] != _CX_CODE or w0[i] != w1[i]:
+            grid[w0[i], i] = _GATE_SYMBOLS[codes[i]]
+
+if numba is not None:
+    _draw_gates = numba.njit(_draw_gates)
 
 
 def create_quantum_circuit_visualization(circuit):
@@ -370,33 +560,20 @@ def create_quantum_circuit_visualization(circuit):
     n_qubits = circuit.n_qubits
     depth = len(circuit.data)
     
-    # Create a textual representation
-    lines = []
-    for i in range(n_qubits):
-        line = f"q{i}: " + "─" * depth
-        lines.append(line)
+    # Gate names and wires as flat arrays (limited to the first 10 gates)
+    gates = circuit.data[:10]
+    codes = np.array([_GATE_CODES.get(gate.name, 0) for gate in gates], dtype=np.int32)
+    w0 = np.array([gate.wires[0] for gate in gates], dtype=np.int32)
+    w1 = np.array([gate.wires[-1] for gate in gates], dtype=np.int32)
     
-    # Add gate symbols (simplified)
-    for i, gate in enumerate(circuit.data[:10]):  # Limit to first 10 gates
-        name = gate.name
-        symbol = "?"
-        if name == "H":
-            symbol = "H"
-        elif name == "X":
-            symbol = "X"
-        elif name == "Z":
-            symbol = "Z"
-        elif name == "CX":
-            symbol = "●"  # Control
-            lines[gate.wires[1]] = lines[gate.wires[1]][:i+4] + "X" + lines[gate.wires[1]][i+5:]
-        elif name == "SWAP":
-            symbol = "×"
-        else:
-            symbol = "U"
-        
-        if name != "CX" or gate.wires[0] != gate.wires[1]:
-            lines[gate.wires[0]] = lines[gate.wires[0]][:i+4] + symbol + lines[gate.wires[0]][i+5:]
+    # Fill a character grid in place instead of rebuilding a line per gate
+    grid = np.full((n_qubits, depth), ord("─"), dtype=np.int32)
+    _draw_gates(grid, codes, w0, w1)
     
+    # The grid holds code points, so the whole grid decodes as UTF-32 in one
+    # call; a byte-per-cell bytearray could not hold the box-drawing wires
+    text = grid.astype('<u4', copy=False).tobytes().decode('utf-32-le')
+    lines = [f"q{i}: " + text[i * depth:(i + 1) * depth] for i in range(n_qubits)]
     return "\n".join(lines)
 
 
@@ -6,9 +6,9 @@ using lambeq's categorical quantum semantics approach
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 from typing import List, Dict, Tuple, Optional, Union
 from dataclasses import dataclass
+from functools import lru_cache
 
 # ========== PREGROUP GRAMMAR TYPING ==========
 
@@ -33,10 +33,10 @@ class AtomicType(Type):
         return self.name
     
     def left_adjoint(self):
-        return AdjointType(self.name, -1)
+        return _adj(self.name, -1)
     
     def right_adjoint(self):
-        return AdjointType(self.name, 1)
+        return _adj(self.name, 1)
 
 class AdjointType(Type):
     """Adjoint type like n^l or n^r"""
@@ -51,10 +51,15 @@ class AdjointType(Type):
             return f"{self.name}^r{self.adjoint if abs(self.adjoint) > 1 else ''}"
     
     def left_adjoint(self):
-        return AdjointType(self.name, self.adjoint - 1)
+        return _adj(self.name, self.adjoint - 1)
     
     def right_adjoint(self):
-        return AdjointType(self.name, self.adjoint + 1)
+        return _adj(self.name, self.adjoint + 1)
+
+@lru_cache(maxsize=None)
+def _adj(name: str, adjoint: int) -> AdjointType:
+    """Interned adjoint type, so each (name, adjoint) pair is a single object"""
+    return AdjointType(name, adjoint)
 
 class TensorType(Type):
     """Tensor product of types"""
@@ -71,10 +76,15 @@ class TensorType(Type):
             return TensorType(self.types + [other])
     
     def left_adjoint(self):
-        return TensorType([t.left_adjoint() for t in reversed(self.types)])
+        return TensorType([_adj(t.name, t.adjoint - 1) for t in self.types[::-1]])
     
     def right_adjoint(self):
-        return TensorType([t.right_adjoint() for t in reversed(self.types)])
+        return TensorType([_adj(t.name, t.adjoint + 1) for t in self.types[::-1]])
+
+@lru_cache(maxsize=None)
+def make_tensor_type(*types: Type) -> TensorType:
+    """Interned tensor product of types, so identical sequences share one object"""
+    return TensorType(list(types))
 
 # Define basic types
 n = AtomicType('n')  # noun type
@@ -87,8 +97,9 @@ lot_type = n
 in_type = n.right_adjoint() * s * n.left_adjoint()
 life_type = n
 
-# Combined type for "someone's lot in life"
-combined_type = someone_type * s_possessive_type * lot_type * in_type * life_type
+# Combined type for "someone's lot in life", built flat in one step rather
+# than through a chain of intermediate products
+combined_type = make_tensor_type(someone_type, *s_possessive_type.types, lot_type, *in_type.types, life_type)
 
 # ========== CATEGORICAL DIAGRAM REPRESENTATION ==========
 
@@ -144,10 +155,51 @@ phrase_diagram = Diagram(
 
 # ========== VECTOR SPACE SEMANTICS ==========
 
+# Words in the order their tensors enter the meaning contraction
+PHRASE_WORDS = ("someone", "'s", "lot", "in", "life")
+
+# The whole reduction as one contraction. Shared letters are the contracted
+# wires: someone·'s on b, 's·lot on e, lot·in on f and in·life on i
+MEANING_EQUATION = "ab,bcde,ef,fghi,ij->acdghj"
+
+@lru_cache(maxsize=None)
+def _specialize_meaning(dim: int):
+    """Generate the meaning GEMM chain for one dimension with every shape as a literal"""
+    d, d3 = dim, dim ** 3
+    src = "\n".join([
+        "def _contract(someone, s_poss, lot, in_tensor, life):",
+        f"    someone_s = np.dot(someone, s_poss.reshape({d}, {d3}))",
+        f"    lot_in = np.dot(lot, in_tensor.reshape({d}, {d3}))",
+        f"    lot_in_life = np.dot(lot_in.reshape({d3}, {d}), life)",
+        f"    meaning = np.dot(someone_s.reshape({d3}, {d}), lot_in_life.reshape({d}, {d3}))",
+        f"    return meaning.reshape({', '.join([str(d)] * 6)})",
+    ])
+    namespace = {"np": np}
+    exec(src, namespace)
+    return namespace["_contract"]
+
+def _random_density_matrices(rng, count: int, dim: int, dtype: np.dtype) -> np.ndarray:
+    """Draw count random pure-state density matrices as one (count, dim, dim) batch"""
+    # One draw for all states, one row-wise normalization, one batched outer product
+    vecs = (rng.normal(size=(count, dim)) + 1j * rng.normal(size=(count, dim))).astype(dtype, copy=False)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    return np.einsum('ki,kj->kij', vecs, vecs.conj())
+
+@lru_cache(maxsize=128)
+def _seeded_density_matrices(count: int, dim: int, seed: int, idx: int, dtype: np.dtype) -> np.ndarray:
+    """Batch of random density matrices, deterministic (and cached) per argument tuple"""
+    rho = _random_density_matrices(np.random.default_rng((seed, idx)), count, dim, dtype)
+    
+    # Cached arrays are shared between models, so they are made read-only
+    rho.flags.writeable = False
+    return rho
+
 class VectorSpaceModel:
     """Distributional semantics model based on vector spaces"""
-    def __init__(self, dim: int = 4):
+    def __init__(self, dim: int = 4, seed: Optional[int] = None, dtype=np.complex64):
         self.dim = dim
+        self.seed = seed  # None draws fresh meanings; an int makes them reproducible
+        self.dtype = np.dtype(dtype)  # single precision halves the tensors' memory traffic
         
         # Define vector spaces for each type
         self.spaces = {
@@ -157,31 +209,57 @@ class VectorSpaceModel:
         
         # Create semantic mapping for each word
         self.semantics = self.initialize_semantics()
+        self.amplitudes = self.compute_amplitudes()
+        
+        # The phrase structure is fixed, so the contraction is generated once
+        # per dimension as straight-line code
+        self._contract = _specialize_meaning(dim)
     
     def create_space(self, dim: int) -> np.ndarray:
         """Create an identity matrix representing a vector space"""
         return np.eye(dim)
     
-    def random_density_matrix(self, dim: int) -> np.ndarray:
+    def random_density_matrices(self, count: int, dim: int, idx: int = 0) -> np.ndarray:
+        """Create a (count, dim, dim) batch of random density matrices"""
+        if self.seed is not None:
+            return _seeded_density_matrices(count, dim, self.seed, idx, self.dtype)
+        return _random_density_matrices(np.random, count, dim, self.dtype)
+    
+    def random_density_matrix(self, dim: int, idx: int = 0) -> np.ndarray:
         """Create a random density matrix"""
-        # Create a random complex vector
-        vec = np.random.normal(size=dim) + 1j * np.random.normal(size=dim)
-        vec = vec / np.linalg.norm(vec)
-        
-        # Create density matrix from pure state
-        return np.outer(vec, vec.conj())
+        return self.random_density_matrices(1, dim, idx)[0]
     
     def initialize_semantics(self) -> Dict[str, np.ndarray]:
         """Initialize word meanings as density matrices"""
+        d = self.dim
+        
+        # Nouns and the factors of the relational words are each drawn as a
+        # single batch. A rank-4 word is the Kronecker product of two (d, d)
+        # density matrices, laid out (i, k, j, l) like a reshaped (d*d, d*d)
+        # one, so no d*d-dimensional state vector or outer product is formed
+        someone, lot, life = self.random_density_matrices(3, d, 0)
+        factors = self.random_density_matrices(4, d, 1)
+        s_poss, in_tensor = np.einsum('nij,nkl->nikjl', factors[0::2], factors[1::2])
+        
         semantics = {
-            "someone": self.random_density_matrix(self.dim),
-            "'s": self.random_density_matrix(self.dim * self.dim).reshape(self.dim, self.dim, self.dim, self.dim),
-            "lot": self.random_density_matrix(self.dim),
-            "in": self.random_density_matrix(self.dim * self.dim).reshape(self.dim, self.dim, self.dim, self.dim),
-            "life": self.random_density_matrix(self.dim)
+            "someone": someone,
+            "'s": s_poss,
+            "lot": lot,
+            "in": in_tensor,
+            "life": life
         }
         return semantics
     
+    def compute_amplitudes(self) -> Dict[str, np.ndarray]:
+        """Magnitudes of the dominant eigenvector of each word's density matrix"""
+        amplitudes = {}
+        for word, rho in self.semantics.items():
+            # Rank-4 meanings are density matrices on the doubled space
+            size = int(np.sqrt(rho.size))
+            _, vectors = np.linalg.eigh(rho.reshape(size, size))
+            amplitudes[word] = np.abs(vectors[:, -1])
+        return amplitudes
+    
     def apply_cup(self, tensor1: np.ndarray, tensor2: np.ndarray, dim: int) -> np.ndarray:
         """Apply a cup (contraction) between two tensors"""
         # Reshape tensors if needed
@@ -195,31 +273,19 @@ class VectorSpaceModel:
     
     def normalize_state(self, state: np.ndarray) -> np.ndarray:
         """Normalize a quantum state"""
-        flat_state = state.reshape(-1)
-        norm = np.linalg.norm(flat_state)
-        return state / norm if norm > 0 else state
+        # ravel is a view for contiguous states and vdot is a single BLAS dot;
+        # scaling by the reciprocal avoids a full complex division per element
+        flat_state = state.ravel()
+        norm = np.sqrt(np.vdot(flat_state, flat_state).real)
+        return state * (1 / norm) if norm > 0 else state
     
     def compute_meaning(self) -> np.ndarray:
         """Compute the meaning of 'someone's lot in life' using tensor contractions"""
-        # Get semantic tensors
-        someone = self.semantics["someone"]
-        s_poss = self.semantics["'s"]
-        lot = self.semantics["lot"]
-        in_tensor = self.semantics["in"]
-        life = self.semantics["life"]
-        
-        # Apply cups (contractions) following the diagram
-        # 1. someone ⊗ 's
-        someone_s = self.apply_cup(someone, s_poss, self.dim)
-        
-        # 2. lot ⊗ in
-        lot_in = self.apply_cup(lot, in_tensor, self.dim)
-        
-        # 3. lot_in ⊗ life
-        lot_in_life = self.apply_cup(lot_in, life, self.dim)
-        
-        # 4. someone_s ⊗ lot_in_life
-        meaning = self.apply_cup(someone_s, lot_in_life, self.dim)
+        # Apply the cups of MEANING_EQUATION as a chain of plain matrix products
+        # (a,cde / e,ghi / egh,j / acd,ghj). Each contracted wire is the last
+        # axis of one operand and the first of the next, so every reshape is a
+        # free view and no step transposes
+        meaning = self._contract(*(self.semantics[word] for word in PHRASE_WORDS))
         
         # Normalize the result
         return self.normalize_state(meaning)
@@ -228,16 +294,54 @@ class VectorSpaceModel:
 
 class QuantumCircuit:
     """More detailed quantum circuit representation"""
-    def __init__(self, num_qubits: int):
+    def __init__(self, num_qubits: int, capacity: int = 16):
         self.num_qubits = num_qubits
-        self.gates = []
         self.parameters = []
+        
+        # Gates are kept as parallel arrays: a name per gate, a (capacity, 2)
+        # target table padded with -1 and a (capacity, P) float64 parameter
+        # table padded with NaN (the same precision as self.parameters),
+        # grown by doubling as gates are added
+        self.gate_types = []
+        self.targets = np.full((capacity, 2), -1, dtype=np.int32)
+        self.params = np.full((capacity, 1), np.nan, dtype=np.float64)
+    
+    @property
+    def gates(self) -> List[Tuple[str, List[int], Optional[List[float]]]]:
+        """The gates as (gate_type, targets, params) tuples"""
+        gates = []
+        for gate_type, targets, params in zip(self.gate_types, self.targets.tolist(), self.params.tolist()):
+            params = [p for p in params if p == p]  # NaN marks an unused slot
+            gates.append((gate_type, [t for t in targets if t >= 0], params or None))
+        return gates
+    
+    def _reserve(self, num_gates: int, num_params: int):
+        """Grow the gate tables to hold num_gates gates of up to num_params parameters"""
+        rows, cols = self.params.shape
+        if num_gates > rows:
+            rows = max(num_gates, 2 * rows)
+            targets = np.full((rows, 2), -1, dtype=np.int32)
+            targets[:len(self.gate_types)] = self.targets[:len(self.gate_types)]
+            self.targets = targets
+        if num_gates > self.params.shape[0] or num_params > cols:
+            params = np.full((rows, max(num_params, cols)), np.nan, dtype=np.float64)
+            params[:len(self.gate_types), :cols] = self.params[:len(self.gate_types)]
+            self.params = params
     
     def add_gate(self, gate_type: str, targets: List[int], params: Optional[List[float]] = None):
         """Add a gate to the circuit"""
-        self.gates.append((gate_type, targets, params))
-        if params:
-            self.parameters.extend(params)
+        self._extend_gates([(gate_type, targets, params)])
+    
+    def _extend_gates(self, gates: List[Tuple[str, List[int], Optional[List[float]]]]):
+        """Append many (gate_type, targets, params) gates at once"""
+        start = len(self.gate_types)
+        self._reserve(start + len(gates), max((len(params or ()) for _, _, params in gates), default=0))
+        for i, (gate_type, targets, params) in enumerate(gates, start):
+            self.targets[i, :len(targets)] = targets
+            if params:
+                self.params[i, :len(params)] = params
+                self.parameters.extend(params)
+        self.gate_types.extend(gate_type for gate_type, _, _ in gates)
     
     def to_matrix(self) -> np.ndarray:
         """Convert the circuit to a unitary matrix (simplified)"""
@@ -247,41 +351,34 @@ class QuantumCircuit:
     
     def draw(self) -> str:
         """Draw a simple ASCII representation of the circuit"""
-        circuit_lines = [f"q{i}: |0⟩ {'═' * 30}" for i in range(self.num_qubits)]
+        # Rows are lists of characters that gates overwrite in place; each row
+        # is joined into a string only once at the end
+        circuit_rows = [list(f"q{i}: |0⟩ {'═' * 30}") for i in range(self.num_qubits)]
+        pos = 10  # Arbitrary position
         
-        for gate_type, targets, params in self.gates:
+        for i, gate_type in enumerate(self.gate_types):
             # This is a very simplified drawing
-            if len(targets) == 1:
+            t0, t1 = self.targets[i].tolist()
+            if t1 < 0:
                 # Single qubit gate
-                line = circuit_lines[targets[0]]
-                pos = 10  # Arbitrary position
                 gate_str = gate_type
-                if params:
-                    gate_str += f"({params[0]:.2f})"
+                param = float(self.params[i, 0])
+                if param == param:
+                    gate_str += f"({param:.2f})"
                 padding = '─' * (len(gate_str) // 2)
-                new_line = line[:pos] + padding + gate_str + padding + line[pos+len(gate_str)+len(padding)*2:]
-                circuit_lines[targets[0]] = new_line
-            elif len(targets) == 2:
+                label = padding + gate_str + padding
+                circuit_rows[t0][pos:pos + len(label)] = label
+            else:
                 # Two qubit gate (like CNOT)
-                min_target = min(targets)
-                max_target = max(targets)
-                for i in range(min_target, max_target + 1):
-                    line = circuit_lines[i]
-                    pos = 10  # Arbitrary position
-                    if i == min_target:
-                        new_line = line[:pos] + '●' + line[pos+1:]
-                    elif i == max_target:
-                        new_line = line[:pos] + '⊕' + line[pos+1:]
-                    else:
-                        new_line = line[:pos] + '│' + line[pos+1:]
-                    circuit_lines[i] = new_line
+                min_target = min(t0, t1)
+                max_target = max(t0, t1)
+                circuit_rows[min_target][pos] = '●'
+                circuit_rows[max_target][pos] = '⊕'
+                for q in range(min_target + 1, max_target):
+                    circuit_rows[q][pos] = '│'
         
         # Add measurement at the end
-        for i in range(self.num_qubits):
-            line = circuit_lines[i]
-            circuit_lines[i] = line + " ─┤M├"
-        
-        return '\n'.join(circuit_lines)
+        return '\n'.join(''.join(row) + " ─┤M├" for row in circuit_rows)
 
 class IQPAnsatz:
     """IQP (Instantaneous Quantum Polynomial) Ansatz for lambeq"""
@@ -289,17 +386,16 @@ class IQPAnsatz:
         self.dim = dim
         self.num_qubits = int(np.ceil(np.log2(dim)))
     
-    def word_to_circuit(self, word: str, vector: np.ndarray) -> QuantumCircuit:
-        """Convert a word's semantic vector to a quantum circuit"""
+    def word_to_circuit(self, word: str, angles: np.ndarray) -> QuantumCircuit:
+        """Convert a word's real rotation angles to a quantum circuit"""
         circuit = QuantumCircuit(self.num_qubits)
         
         # Prepare qubits in uniform superposition
         for i in range(self.num_qubits):
             circuit.add_gate("H", [i], None)
         
-        # Add Z-rotations based on vector components
-        for i in range(min(self.num_qubits, len(vector))):
-            angle = np.arccos(np.abs(vector[i])) * 2
+        # Add Z-rotations with the word's angles
+        for i, angle in enumerate(np.asarray(angles[:self.num_qubits]).tolist()):
             circuit.add_gate("RZ", [i], [angle])
         
         # Add entangling CZ gates in IQP pattern
@@ -316,17 +412,19 @@ class IQPAnsatz:
         circuit = QuantumCircuit(total_qubits)
         
         # Add individual word circuits
-        for i, (word, vec) in enumerate(vector_model.semantics.items()):
-            # Flatten higher-order tensors to vectors
-            flat_vec = vec.reshape(-1)[:self.dim]
-            word_circuit = self.word_to_circuit(word, flat_vec)
+        for i, (word, amplitudes) in enumerate(vector_model.amplitudes.items()):
+            # Angles from the magnitudes of the dominant eigenvector. The words
+            # are pure states, so their spectra are all [1, 0, ...] and carry
+            # no meaning, while the eigenvector is the state itself
+            amplitudes = np.clip(amplitudes[:self.num_qubits], 0.0, 1.0)
+            word_circuit = self.word_to_circuit(word, 2.0 * np.arccos(amplitudes))
             
-            # Add gates to the main circuit with offset
+            # Add gates to the main circuit with adjusted target indices
             offset = i * self.num_qubits
-            for gate_type, targets, params in word_circuit.gates:
-                # Adjust target indices
-                adjusted_targets = [t + offset for t in targets]
-                circuit.add_gate(gate_type, adjusted_targets, params)
+            circuit._extend_gates([
+                (gate_type, [t + offset for t in targets], params)
+                for gate_type, targets, params in word_circuit.gates
+            ])
         
         # Add entangling gates between words based on cups
         # someone ⊗ 's
@@ -342,7 +440,7 @@ class IQPAnsatz:
 
 # ========== NORMALIZATION PROCESS ==========
 
-def normalize_lot_in_life():
+def normalize_lot_in_life(seed: Optional[int] = None):
     """Complete normalization process for 'someone's lot in life'"""
     print("=== Pregroup Grammar Analysis ===")
     print(f"someone: {someone_type}")
@@ -362,7 +460,7 @@ def normalize_lot_in_life():
     print("\n=== Vector Space Semantics ===")
     # Initialize vector space model
     dim = 4  # Use a small dimension for demonstration
-    vsm = VectorSpaceModel(dim)
+    vsm = VectorSpaceModel(dim, seed)
     
     # Compute meaning
     meaning = vsm.compute_meaning()
@@ -386,7 +484,8 @@ def normalize_lot_in_life():
     
     print("\n=== Normalized Representation ===")
     # Find principal components of the meaning
-    u, s, vh = np.linalg.svd(meaning)
+    # Only the singular values are reported, so U and Vh are never formed
+    s = np.linalg.svd(meaning, compute_uv=False)
     
     print("Singular values of meaning tensor:")
     print(s)
@@ -5,9 +5,15 @@ Normalization of "someone's lot in life" using Lambeq and Categorical Quantum Li
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
+import opt_einsum as oe
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 
+try:
+    import numba
+except ImportError:  # numba is optional; compose_meanings then uses opt_einsum
+    numba = None
+
 # Simulating lambeq and discopy imports
 # In a real environment you would use:
 # from lambeq import BobcatParser, AtomicType, IQPAnsatz
@@ -86,14 +92,29 @@ class VectorSpace:
         self.dimension = dimension
         self.name = name
     
-    def random_vector(self) -> np.ndarray:
+    def random_vector(self, rng=np.random) -> np.ndarray:
         """Generate a random unit vector in this space"""
-        vec = np.random.randn(self.dimension)
+        vec = rng.standard_normal(self.dimension)
         return vec / np.linalg.norm(vec)
 
 # Semantic mapping from words to vectors
-def semantic_mapping(dim: int = 4) -> Dict[str, np.ndarray]:
+def semantic_mapping(dim: int = 4, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
     """Create semantic vectors for words in the phrase"""
+    if seed is not None:
+        # Seeded mappings are deterministic, so they are built once and shared
+        return dict(_seeded_semantic_mapping(dim, seed))
+    return _build_semantics(dim, np.random)
+
+@lru_cache(maxsize=128)
+def _seeded_semantic_mapping(dim: int, seed: int) -> Dict[str, np.ndarray]:
+    """Semantic vectors drawn from a generator seeded with seed, cached per (dim, seed)"""
+    semantics = _build_semantics(dim, np.random.default_rng(seed))
+    for vec in semantics.values():
+        vec.flags.writeable = False
+    return semantics
+
+def _build_semantics(dim: int, rng) -> Dict[str, np.ndarray]:
+    """Draw the semantic vectors for every word from rng"""
     # Create vector spaces
     entity_space = VectorSpace(dim, "entity")
     relation_space = VectorSpace(dim, "relation")
@@ -101,33 +122,63 @@ def semantic_mapping(dim: int = 4) -> Dict[str, np.ndarray]:
     
     # Initialize semantic vectors
     semantics = {
-        "someone": entity_space.random_vector(),
-        "s_poss": np.outer(entity_space.random_vector(), entity_space.random_vector()).reshape(dim*dim),
-        "lot": entity_space.random_vector(),
-        "in": np.outer(relation_space.random_vector(), context_space.random_vector()).reshape(dim*dim),
-        "life": context_space.random_vector()
+        "someone": entity_space.random_vector(rng),
+        "s_poss": np.multiply.outer(entity_space.random_vector(rng), entity_space.random_vector(rng)),
+        "lot": entity_space.random_vector(rng),
+        "in": np.multiply.outer(relation_space.random_vector(rng), context_space.random_vector(rng)),
+        "life": context_space.random_vector(rng)
     }
     
     return semantics
 
+# Compositional steps as one contraction: 's applied to someone (j), in
+# applied to lot (l), and life joined to the relation wire (k) by a copy
+# spider, so the phrase keeps one entity and one relation wire
+COMPOSE_EQUATION = "ij,j,kl,l,k->ik"
+
+@lru_cache(maxsize=None)
+def _compose_plan(dim: int):
+    """Contraction expression for compose_meanings, planned once per dimension"""
+    return oe.contract_expression(
+        COMPOSE_EQUATION, (dim, dim), (dim,), (dim, dim), (dim,), (dim,), optimize='greedy'
+    )
+
+def _compose_kernel(s_poss, someone, in_matrix, lot, life):
+    """COMPOSE_EQUATION followed by normalization, as explicit loops for Numba"""
+    dim = someone.shape[0]
+    result = np.empty(dim * dim)
+    total = 0.0
+    for i in range(dim):
+        someone_s = 0.0
+        for j in range(dim):
+            someone_s += s_poss[i, j] * someone[j]
+        for k in range(dim):
+            lot_in = 0.0
+            for l in range(dim):
+                lot_in += in_matrix[k, l] * lot[l]
+            value = someone_s * lot_in * life[k]
+            result[i * dim + k] = value
+            total += value * value
+    return result / np.sqrt(total)
+
+if numba is not None:
+    # The word vectors are tiny, so NumPy's per-call dispatch dominates the
+    # contraction; compiled loops leave only the arithmetic
+    _compose_kernel = numba.njit(fastmath=True)(_compose_kernel)
+
 # Tensor contraction for semantic composition
 def compose_meanings(semantics: Dict[str, np.ndarray], dim: int = 4) -> np.ndarray:
     """Compose the meanings according to pregroup grammar reduction"""
-    # Reshape relational tensors to matrices for composition
-    s_poss_matrix = semantics["s_poss"].reshape(dim, dim)
-    in_matrix = semantics["in"].reshape(dim, dim)
-    
-    # Compositional steps (tensors contracting along pregroup grammar)
-    someone_s = np.dot(s_poss_matrix, semantics["someone"])
-    lot_in = np.dot(in_matrix, semantics["lot"])
-    lot_in_life = np.dot(semantics["life"], lot_in)
-    
-    # Final composition
-    result = np.outer(someone_s, lot_in_life)
+    # Compositional steps (tensors contracting along pregroup grammar);
+    # the relational words are already stored as (dim, dim) matrices
+    operands = (semantics["s_poss"], semantics["someone"], semantics["in"], semantics["lot"], semantics["life"])
+    if numba is not None:
+        return _compose_kernel(*operands)
+    result = _compose_plan(dim)(*operands)
     
     # Normalize the result
-    result_flat = result.reshape(-1)
-    return result_flat / np.linalg.norm(result_flat)
+    result_flat = result.ravel()
+    return result_flat / np.sqrt(np.vdot(result_flat, result_flat).real)
 
 # Quantum circuit representation
 class QuantumCircuit:
@@ -142,32 +193,25 @@ class QuantumCircuit:
     
     def draw(self):
         """Draw a simple ASCII representation of the circuit"""
-        circuit_lines = [f"q{i}: {'-' * 20}" for i in range(self.num_qubits)]
+        # Rows are lists of characters updated in place and joined once at the end
+        circuit_rows = [list(f"q{i}: {'-' * 20}") for i in range(self.num_qubits)]
+        pos = 10  # Arbitrary position
         
         for gate_type, targets, params in self.gates:
             # This is a very simplified drawing - a real implementation would be more complex
             if len(targets) == 1:
                 # Single qubit gate
-                line = circuit_lines[targets[0]]
-                pos = 10  # Arbitrary position
-                new_line = line[:pos] + gate_type[:1] + line[pos+1:]
-                circuit_lines[targets[0]] = new_line
+                circuit_rows[targets[0]][pos:pos + 1] = gate_type[:1]
             elif len(targets) == 2:
                 # Two qubit gate (like CNOT)
                 min_target = min(targets)
                 max_target = max(targets)
-                for i in range(min_target, max_target + 1):
-                    line = circuit_lines[i]
-                    pos = 10  # Arbitrary position
-                    if i == min_target:
-                        new_line = line[:pos] + '•' + line[pos+1:]
-                    elif i == max_target:
-                        new_line = line[:pos] + 'X' + line[pos+1:]
-                    else:
-                        new_line = line[:pos] + '|' + line[pos+1:]
-                    circuit_lines[i] = new_line
+                circuit_rows[min_target][pos] = '•'
+                circuit_rows[max_target][pos] = 'X'
+                for i in range(min_target + 1, max_target):
+                    circuit_rows[i][pos] = '|'
         
-        return '\n'.join(circuit_lines)
+        return '\n'.join(''.join(row) for row in circuit_rows)
 
 # Semantic vectors to quantum circuit mapping
 def create_circuit_ansatz(semantics: Dict[str, np.ndarray], dim: int = 4) -> QuantumCircuit:
@@ -182,11 +226,10 @@ def create_circuit_ansatz(semantics: Dict[str, np.ndarray], dim: int = 4) -> Qua
     # Add single-qubit rotations based on semantic vectors
     for word_idx, (word, vec) in enumerate(semantics.items()):
         start_qubit = word_idx * qubits_per_word
-        for i in range(qubits_per_word):
-            # Map vector components to rotation angles
-            if i < len(vec):
-                angle = np.arccos(vec[i % len(vec)])
-                circuit.add_gate("Ry", [start_qubit + i], [angle])
+        # Map vector components to rotation angles in one NumPy call
+        angles = np.arccos(np.ravel(vec)[:qubits_per_word]).tolist()
+        for i, angle in enumerate(angles):
+            circuit.add_gate("Ry", [start_qubit + i], [angle])
     
     # Add entangling gates based on the pregroup grammar
     # someone's
@@ -199,10 +242,10 @@ def create_circuit_ansatz(semantics: Dict[str, np.ndarray], dim: int = 4) -> Qua
     return circuit
 
 # Normalizing "lot in life" through categorical quantum semantics
-def normalize_lot_in_life(dim: int = 4) -> Dict:
+def normalize_lot_in_life(dim: int = 4, seed: Optional[int] = None) -> Dict:
     """Full process of normalizing 'someone's lot in life'"""
     # 1. Define the semantic vectors
-    semantics = semantic_mapping(dim)
+    semantics = semantic_mapping(dim, seed)
     
     # 2. Compose meanings via tensor contraction
     composed_meaning = compose_meanings(semantics, dim)
@@ -210,8 +253,9 @@ def normalize_lot_in_life(dim: int = 4) -> Dict:
     # 3. Create quantum circuit representation
     circuit = create_circuit_ansatz(semantics, dim)
     
-    # 4. Analyze the normalized representation (simplified)
-    principal_components = np.linalg.svd(composed_meaning.reshape(dim, dim))[0][:2]
+    # 4. Analyze the normalized representation (simplified): the two leading
+    # left singular vectors are the first two columns of U
+    principal_components = np.linalg.svd(composed_meaning.reshape(dim, dim))[0][:, :2]
     
     return {
         "semantics": semantics,
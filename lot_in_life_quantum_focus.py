@@ -5,11 +5,12 @@ Quantum-Focused Implementation of "someone's lot in life" using Lambeq
 Focuses on detailed quantum circuit generation and simulation
 """
 
+import math
 import numpy as np
+import opt_einsum as oe
 from typing import List, Dict, Tuple, Union, Optional
-import matplotlib.pyplot as plt
 from dataclasses import dataclass
-from collections import defaultdict
+from functools import cached_property, lru_cache
 
 # Simulated imports (in a real environment you'd use actual libraries)
 # from lambeq import BobcatParser, AtomicType, IQPAnsatz, SpiderAnsatz, CircuitModel
@@ -18,10 +19,42 @@ from collections import defaultdict
 # from pytket.architecture import Architecture
 # from pytket.passes import DecomposeBoxes, FullPeepholeOptimise
 
+# One generator shared by all random draws instead of the legacy global state
+_RNG = np.random.default_rng()
+
+# From this many qubits on, 2^n no longer fits in int64, so outcomes are
+# sampled as rows of bits instead of integers
+_WIDE_REGISTER_QUBITS = 63
+
+def set_seed(seed: Optional[int] = None):
+    """Reseed the shared random generator for reproducible runs"""
+    global _RNG
+    _RNG = np.random.default_rng(seed)
+
 # ========== PREGROUP GRAMMAR ==========
 
 class Type:
     """Base type for pregroup grammar"""
+    # Subclasses fix their repr at construction; equality and hashing use it
+    __slots__ = ('_repr', '_hash')
+    
+    def __init__(self):
+        # A bare Type is the monoidal unit
+        self._freeze("1")
+    
+    def _freeze(self, text: str):
+        self._repr = text
+        self._hash = hash(text)
+    
+    def __repr__(self):
+        return self._repr
+    
+    def __eq__(self, other):
+        return isinstance(other, Type) and self._repr == other._repr
+    
+    def __hash__(self):
+        return self._hash
+    
     def __mul__(self, other):
         if isinstance(other, Type):
             return FunctorType([self, other])
@@ -33,11 +66,11 @@ class Type:
 
 class BaseType(Type):
     """Base atomic type like n or s"""
+    __slots__ = ('name',)
+    
     def __init__(self, name):
         self.name = name
-    
-    def __repr__(self):
-        return self.name
+        self._freeze(name)
     
     def left_adjoint(self):
         return AdjointType(self, -1)
@@ -47,6 +80,8 @@ class BaseType(Type):
 
 class AdjointType(Type):
     """Adjoint type like n^l or n^r"""
+    __slots__ = ('base', 'adjoint')
+    
     def __init__(self, base, adjoint):
         if isinstance(base, BaseType):
             self.base = base
@@ -55,12 +90,10 @@ class AdjointType(Type):
         else:
             raise TypeError(f"Base must be BaseType or str, not {type(base)}")
         self.adjoint = adjoint
-    
-    def __repr__(self):
-        if self.adjoint < 0:
-            return f"{self.base}^l{abs(self.adjoint) if abs(self.adjoint) > 1 else ''}"
+        if adjoint < 0:
+            self._freeze(f"{self.base}^l{abs(adjoint) if abs(adjoint) > 1 else ''}")
         else:
-            return f"{self.base}^r{self.adjoint if self.adjoint > 1 else ''}"
+            self._freeze(f"{self.base}^r{adjoint if adjoint > 1 else ''}")
     
     def left_adjoint(self):
         return AdjointType(self.base, self.adjoint - 1)
@@ -70,11 +103,11 @@ class AdjointType(Type):
 
 class FunctorType(Type):
     """Functor type (tensor product of types)"""
+    __slots__ = ('types',)
+    
     def __init__(self, types):
         self.types = types
-    
-    def __repr__(self):
-        return " ⊗ ".join(str(t) for t in self.types)
+        self._freeze(" ⊗ ".join(str(t) for t in types))
     
     def __mul__(self, other):
         if isinstance(other, FunctorType):
@@ -103,6 +136,10 @@ life_type = n
 
 full_type = someone_type * s_poss_type * lot_type * in_type * life_type
 
+def type_wires(ty: Type) -> List[Type]:
+    """The individual wires (atomic or adjoint types) making up a type"""
+    return list(ty.types) if isinstance(ty, FunctorType) else [ty]
+
 @dataclass
 class Cup:
     """Cup/evaluation in string diagrams"""
@@ -129,6 +166,10 @@ class Diagram:
     
     def __str__(self):
         return f"Diagram: {self.dom} → {self.cod} with {len(self.boxes)} boxes and {len(self.cups)} cups"
+    
+    def wire_boxes(self) -> List[int]:
+        """Index of the box each wire comes from, with wires numbered left to right"""
+        return [i for i, box in enumerate(self.boxes) for _ in type_wires(box.cod)]
 
 # ========== VECTOR SPACE SEMANTICS ==========
 
@@ -137,19 +178,37 @@ class VectorSpace:
     def __init__(self, dim: int, name: str = ""):
         self.dim = dim
         self.name = name
-        self.basis = np.eye(dim)
+    
+    @cached_property
+    def basis(self) -> np.ndarray:
+        """Standard basis, built on first use"""
+        return np.eye(self.dim)
+    
+    def random_states(self, n: int) -> np.ndarray:
+        """Generate n random pure states as the rows of an (n, dim) array"""
+        # Create random complex vectors from interleaved real/imaginary parts
+        states = _RNG.standard_normal((n, self.dim, 2)).view(np.complex128)[..., 0]
+        # Normalize
+        return states / np.linalg.norm(states, axis=-1, keepdims=True)
     
     def random_state(self) -> np.ndarray:
         """Generate a random pure state"""
-        # Create a random complex vector
-        state = np.random.normal(size=self.dim) + 1j * np.random.normal(size=self.dim)
-        # Normalize
-        return state / np.linalg.norm(state)
+        return self.random_states(1)[0]
+    
+    def random_tensor(self, rank: int) -> np.ndarray:
+        """Generate a random pure state of the rank-fold tensor power, shape (dim,) * rank"""
+        tensor = _RNG.standard_normal((self.dim,) * rank + (2,)).view(np.complex128)[..., 0]
+        tensor /= np.linalg.norm(tensor.ravel())
+        return tensor
+    
+    def random_density_matrices(self, n: int) -> np.ndarray:
+        """Generate n random density matrices as an (n, dim, dim) array"""
+        states = self.random_states(n)
+        return np.einsum('ni,nj->nij', states, states.conj())
     
     def random_density_matrix(self) -> np.ndarray:
         """Generate a random density matrix"""
-        state = self.random_state()
-        return np.outer(state, np.conj(state))
+        return self.random_density_matrices(1)[0]
 
 class CategoryFunctor:
     """Functor from pregroup category to vector spaces"""
@@ -167,21 +226,41 @@ class CategoryFunctor:
             's^r': dim,
             's^l': dim
         }
+        # Dimensions already computed, keyed by the type objects themselves
+        self._type_dims = {}
+        # Word meanings already drawn, keyed by (word, type)
+        self._word_tensors = {}
     
     def map_type(self, ty: Type) -> int:
         """Map a pregroup type to a dimension"""
+        dim = self._type_dims.get(ty)
+        if dim is not None:
+            return dim
+        
         if isinstance(ty, BaseType):
-            return self.type_to_dim[ty.name]
+            dim = self.type_to_dim[ty.name]
         elif isinstance(ty, AdjointType):
-            return self.type_to_dim[str(ty)]
+            dim = self.type_to_dim[str(ty)]
         elif isinstance(ty, FunctorType):
             # Return product of dimensions
-            return np.prod([self.map_type(t) for t in ty.types])
+            dim = math.prod(self.map_type(t) for t in ty.types)
         else:
             raise TypeError(f"Unknown type: {type(ty)}")
+        self._type_dims[ty] = dim
+        return dim
     
     def map_word(self, word: str, ty: Type) -> np.ndarray:
-        """Map a word to a matrix representing its meaning"""
+        """Map a word to a matrix representing its meaning, drawn once per (word, type)"""
+        key = (word, repr(ty))
+        tensor = self._word_tensors.get(key)
+        if tensor is None:
+            tensor = self._word_tensors[key] = self._draw_word(ty)
+            # The same tensor is handed to every caller, so keep it read-only
+            tensor.flags.writeable = False
+        return tensor
+    
+    def _draw_word(self, ty: Type) -> np.ndarray:
+        """Draw a fresh meaning for a word of the given type"""
         dim = self.map_type(ty)
         
         # For simplicity, create a random density matrix
@@ -191,10 +270,10 @@ class CategoryFunctor:
             space = self.spaces[ty.name]
             return space.random_state()
         elif isinstance(ty, FunctorType):
-            # For functor types, create a tensor
+            # For functor types, create a tensor with one axis per wire,
+            # drawn directly in that shape
             # Simplified for demonstration
-            space = VectorSpace(dim)
-            return space.random_density_matrix().reshape([self.dim] * int(np.log2(dim) / np.log2(self.dim)))
+            return VectorSpace(self.dim).random_tensor(len(ty.types))
         else:
             # For adjoint types
             space = VectorSpace(dim)
@@ -207,14 +286,37 @@ class CategoryFunctor:
             if box.matrix is None:
                 box.matrix = self.map_word(box.name, box.cod)
         
-        # Apply cups (simplified)
-        # A real implementation would do proper tensor contractions
-        result = np.eye(self.dim)
+        # Each tensor carries the wire numbers of its axes, which come from
+        # the box's codomain type
+        tensors, start = [], 0
         for box in diag.boxes:
-            if isinstance(box.matrix, np.ndarray):
-                result = np.matmul(result, box.matrix.reshape(self.dim, -1)[:, :self.dim])
-        
-        return result
+            rank = len(type_wires(box.cod))
+            tensors.append((box.matrix, list(range(start, start + rank))))
+            start += rank
+        
+        # Apply cups one at a time: a tensordot over the two wires' axes
+        # (a BLAS GEMM/GEMV), or a trace when both already sit on one tensor
+        for cup in diag.cups:
+            i = next(k for k, (_, wires) in enumerate(tensors) if cup.left in wires)
+            j = next(k for k, (_, wires) in enumerate(tensors) if cup.right in wires)
+            a, wires_a = tensors[i]
+            x = wires_a.index(cup.left)
+            if i == j:
+                y = wires_a.index(cup.right)
+                remaining = [w for w in wires_a if w not in (cup.left, cup.right)]
+                tensors[i] = (np.trace(a, axis1=x, axis2=y), remaining)
+            else:
+                b, wires_b = tensors[j]
+                y = wires_b.index(cup.right)
+                merged = np.tensordot(a, b, axes=([x], [y]))
+                tensors[min(i, j)] = (merged, wires_a[:x] + wires_a[x + 1:] + wires_b[:y] + wires_b[y + 1:])
+                del tensors[max(i, j)]
+        
+        # Join whatever is left unconnected and put the open wires in order
+        result, wires = tensors[0]
+        for tensor, more_wires in tensors[1:]:
+            result, wires = np.tensordot(result, tensor, axes=0), wires + more_wires
+        return result.transpose(np.argsort(wires))
 
 # ========== QUANTUM CIRCUIT REPRESENTATION ==========
 
@@ -226,6 +328,30 @@ class QuantumGate:
         self.controls = controls if controls is not None else []
         self.params = params if params is not None else []
     
+    def matrix(self) -> np.ndarray:
+        """Unitary on the gate's qubits, controls first then targets"""
+        name = self.name[1:] if self.name in ("CNOT", "CZ") else self.name
+        if name in ("X", "NOT"):
+            base = np.array([[0, 1], [1, 0]], dtype=complex)
+        elif name == "Z":
+            base = np.diag([1, -1]).astype(complex)
+        elif name == "H":
+            base = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+        elif name == "RY":
+            c, s = np.cos(self.params[0] / 2), np.sin(self.params[0] / 2)
+            base = np.array([[c, -s], [s, c]], dtype=complex)
+        elif name == "RZ":
+            phase = np.exp(0.5j * self.params[0])
+            base = np.diag([phase.conjugate(), phase])
+        else:
+            raise ValueError(f"Unknown gate: {self.name}")
+        
+        # Controls apply the base gate only on their all-ones block
+        size = 2 ** (len(self.controls) + len(self.targets))
+        result = np.eye(size, dtype=complex)
+        result[-2:, -2:] = base
+        return result
+    
     def __str__(self):
         param_str = ""
         if self.params:
@@ -235,72 +361,260 @@ class QuantumGate:
             control_str = f", controls={self.controls}"
         return f"{self.name}{param_str}({self.targets}{control_str})"
 
+# A circuit structure is its gates' (name, targets, controls), without parameters
+CircuitStructure = Tuple[Tuple[str, Tuple[int, ...], Tuple[int, ...]], ...]
+
+@lru_cache(maxsize=32)
+def _circuit_expression(num_qubits: int, structure: CircuitStructure):
+    """Contraction of |0...0⟩ through a gate sequence, planned once per structure"""
+    # Each qubit wire gets a fresh label every time a gate acts on it; gate
+    # tensors are indexed (outputs..., inputs...), controls before targets
+    wires = list(range(num_qubits))
+    terms = [oe.get_symbol(w) for w in wires]
+    shapes = []
+    next_label = num_qubits
+    for _, targets, controls in structure:
+        axes = controls + targets
+        outputs = list(range(next_label, next_label + len(axes)))
+        next_label += len(axes)
+        terms.append(''.join(oe.get_symbol(label) for label in outputs + [wires[q] for q in axes]))
+        shapes.append((2,) * (2 * len(axes)))
+        for q, label in zip(axes, outputs):
+            wires[q] = label
+    subscripts = f"{','.join(terms)}->{''.join(oe.get_symbol(w) for w in wires)}"
+    
+    # The initial kets are fixed, so only gate tensors are passed per call
+    zero = np.array([1, 0], dtype=complex)
+    return oe.contract_expression(
+        subscripts, *[zero] * num_qubits, *shapes, constants=list(range(num_qubits))
+    )
+
 class QuantumCircuit:
     """Representation of a quantum circuit"""
-    def __init__(self, num_qubits: int):
+    def __init__(self, num_qubits: int, capacity: int = 16):
         self.num_qubits = num_qubits
-        self.gates: List[QuantumGate] = []
+        
+        # Gates are kept as parallel arrays: a name per gate, target and
+        # control tables padded with -1 and a parameter table padded with
+        # NaN, grown by doubling as gates are added
+        self.names: List[str] = []
+        self.targets = np.full((capacity, 1), -1, dtype=np.int32)
+        self.controls = np.full((capacity, 1), -1, dtype=np.int32)
+        self.params = np.full((capacity, 1), np.nan, dtype=np.float64)
+    
+    @property
+    def num_gates(self) -> int:
+        return len(self.names)
+    
+    @property
+    def gates(self) -> List[QuantumGate]:
+        """The gates as QuantumGate objects"""
+        count = self.num_gates
+        return [
+            QuantumGate(name, [t for t in targets if t >= 0], [c for c in controls if c >= 0],
+                        [p for p in params if p == p])  # NaN marks an unused slot
+            for name, targets, controls, params in zip(
+                self.names, self.targets[:count].tolist(),
+                self.controls[:count].tolist(), self.params[:count].tolist()
+            )
+        ]
+    
+    def _grown(self, table: np.ndarray, rows: int, cols: int, fill) -> np.ndarray:
+        """The table itself if it is large enough, else a larger copy"""
+        if rows <= table.shape[0] and cols <= table.shape[1]:
+            return table
+        grown = np.full((max(rows, table.shape[0]), max(cols, table.shape[1])), fill, dtype=table.dtype)
+        grown[:self.num_gates, :table.shape[1]] = table[:self.num_gates]
+        return grown
+    
+    def _reserve(self, num_gates: int, num_targets: int = 1, num_controls: int = 1, num_params: int = 1):
+        """Grow the gate tables to hold num_gates gates of the given widths"""
+        rows = self.targets.shape[0]
+        if num_gates > rows:
+            rows = max(num_gates, 2 * rows)
+        self.targets = self._grown(self.targets, rows, num_targets, -1)
+        self.controls = self._grown(self.controls, rows, num_controls, -1)
+        self.params = self._grown(self.params, rows, num_params, np.nan)
     
     def add_gate(self, name: str, targets: List[int], controls: List[int] = None, params: List[float] = None):
         """Add a gate to the circuit"""
-        gate = QuantumGate(name, targets, controls, params)
-        self.gates.append(gate)
+        i = self.num_gates
+        self._reserve(i + 1, len(targets), len(controls or ()), len(params or ()))
+        self.targets[i, :len(targets)] = targets
+        if controls:
+            self.controls[i, :len(controls)] = controls
+        if params:
+            self.params[i, :len(params)] = params
+        self.names.append(name)
+        return self
+    
+    def add_gates(self, name: Union[str, List[str]], targets, controls=None, params=None):
+        """Add one gate per row of the target (and control/parameter) arrays,
+        all with the same name or one name per row"""
+        start, count = self.num_gates, len(targets)
+        if count == 0:
+            return self
+        columns = [np.asarray(targets).reshape(count, -1)]
+        for table, fill in ((controls, -1), (params, np.nan)):
+            columns.append(np.full((count, 1), fill) if table is None else np.asarray(table).reshape(count, -1))
+        self._reserve(start + count, *(column.shape[1] for column in columns))
+        rows = slice(start, start + count)
+        for table, column in zip((self.targets, self.controls, self.params), columns):
+            table[rows, :column.shape[1]] = column
+        self.names.extend([name] * count if isinstance(name, str) else name)
+        return self
+    
+    def extend(self, other: 'QuantumCircuit', offset: int = 0):
+        """Append another circuit's gates with its qubits shifted by offset"""
+        start, count = self.num_gates, other.num_gates
+        self._reserve(start + count, other.targets.shape[1], other.controls.shape[1], other.params.shape[1])
+        rows = slice(start, start + count)
+        for table, source in ((self.targets, other.targets), (self.controls, other.controls)):
+            block = source[:count]
+            table[rows, :block.shape[1]] = np.where(block >= 0, block + offset, -1)
+        self.params[rows, :other.params.shape[1]] = other.params[:count]
+        self.names.extend(other.names)
         return self
     
+    def copy(self) -> 'QuantumCircuit':
+        """An independent copy of the circuit"""
+        circuit = QuantumCircuit(self.num_qubits, capacity=max(1, self.num_gates))
+        return circuit.extend(self)
+    
     def to_matrix(self) -> np.ndarray:
-        """Convert the circuit to a unitary matrix (simplified)"""
-        # Just a placeholder - actual implementation would compute the unitary
-        return np.eye(2**self.num_qubits)
+        """Convert the circuit to a unitary matrix"""
+        n = self.num_qubits
+        # One axis per qubit (qubit 0 most significant) plus a column axis
+        unitary = np.eye(2**n, dtype=complex).reshape((2,) * n + (2**n,))
+        for gate in self.gates:
+            axes = list(gate.controls) + list(gate.targets)
+            order = axes + [a for a in range(n + 1) if a not in axes]
+            # Bring the gate's qubits to the front and apply it as one GEMM,
+            # never expanding the gate to the full 2^n x 2^n space
+            moved = unitary.transpose(order)
+            applied = gate.matrix() @ moved.reshape(2 ** len(axes), -1)
+            unitary = applied.reshape(moved.shape).transpose(np.argsort(order))
+        return unitary.reshape(2**n, 2**n)
+    
+    def structure(self) -> CircuitStructure:
+        """The circuit's gate layout, ignoring parameters"""
+        count = self.num_gates
+        return tuple(
+            (name, tuple(t for t in targets if t >= 0), tuple(c for c in controls if c >= 0))
+            for name, targets, controls in zip(
+                self.names, self.targets[:count].tolist(), self.controls[:count].tolist()
+            )
+        )
+    
+    def statevector(self) -> np.ndarray:
+        """Final state from |0...0⟩, reusing the contraction path of earlier
+        circuits with the same structure"""
+        expression = _circuit_expression(self.num_qubits, self.structure())
+        tensors = [
+            gate.matrix().reshape((2,) * (2 * (len(gate.controls) + len(gate.targets))))
+            for gate in self.gates
+        ]
+        return expression(*tensors).reshape(-1)
     
     def draw(self) -> str:
         """Draw an ASCII representation of the circuit"""
-        lines = [f"q{i}: |0⟩ {'─' * 50}" for i in range(self.num_qubits)]
+        count = self.num_gates
+        labels = [self._gate_label(name, param) for name, param in zip(self.names, self.params[:count, 0].tolist())]
+        width = max([50] + [5 * i + len(label) for i, label in enumerate(labels)])
+        
+        # One character cell per wire position, written in place
+        buf = np.full((self.num_qubits, width), '─', dtype='<U1')
         
         # Place gates at appropriate locations
-        for i, gate in enumerate(self.gates):
-            position = 5 + i * 5  # arbitrary spacing
+        rows = zip(labels, self.targets[:count].tolist(), self.controls[:count, 0].tolist())
+        for i, (label, targets, control) in enumerate(rows):
+            position = i * 5  # arbitrary spacing
+            if targets[1:] and targets[1] >= 0:
+                continue  # Multi-target gates are not drawn
+            target = targets[0]
             
-            if len(gate.targets) == 1 and not gate.controls:
+            if control < 0:
                 # Single-qubit gate
-                target = gate.targets[0]
-                gate_str = gate.name
-                if gate.params:
-                    gate_str += f"({gate.params[0]:.2f})"
-                gate_width = len(gate_str)
-                
-                # Replace characters at position
-                line = lines[target]
-                new_line = line[:position] + '┤' + gate_str + '├' + line[position + gate_width + 2:]
-                lines[target] = new_line
-                
-            elif len(gate.targets) == 1 and gate.controls:
-                # Controlled gate
-                target = gate.targets[0]
-                control = gate.controls[0]
-                
-                # Draw control qubit
-                line = lines[control]
-                new_line = line[:position] + '●' + line[position + 1:]
-                lines[control] = new_line
-                
-                # Draw target qubit
-                line = lines[target]
-                new_line = line[:position] + '⊕' + line[position + 1:]
-                lines[target] = new_line
-                
-                # Draw vertical line connecting control and target
-                min_q = min(control, target)
-                max_q = max(control, target)
-                for q in range(min_q + 1, max_q):
-                    line = lines[q]
-                    new_line = line[:position] + '│' + line[position + 1:]
-                    lines[q] = new_line
-        
-        # Add measurements at the end
-        for i in range(self.num_qubits):
-            lines[i] += ' ┤M├'
-        
-        return '\n'.join(lines)
+                buf[target, position:position + len(label)] = list(label)
+            else:
+                # Controlled gate: control, target and the vertical line between
+                buf[min(control, target) + 1:max(control, target), position] = '│'
+                buf[control, position] = '●'
+                buf[target, position] = '⊕'
+        
+        # Add wire labels and measurements at the end
+        return '\n'.join(
+            f"q{i}: |0⟩ {''.join(row)} ┤M├" for i, row in enumerate(buf)
+        )
+    
+    @staticmethod
+    def _gate_label(name: str, param: float) -> str:
+        """Boxed label of a single-qubit gate, with NaN for no parameter"""
+        if param == param:
+            name += f"({param:.2f})"
+        return '┤' + name + '├'
+
+def _rotation_layout(num_qubits: int, num_components: int):
+    """Target and controls (padded with -1) of the RY gate for each component"""
+    targets = np.zeros(num_components, dtype=np.int32)
+    controls = np.full((num_components, max(1, num_qubits - 1)), -1, dtype=np.int32)
+    for i in range(num_components):
+        # Active qubits are the set bits of i, most significant on qubit 0;
+        # the first is the target and the rest are controls
+        k = -1
+        for q in range(num_qubits):
+            if (i >> (num_qubits - 1 - q)) & 1:
+                if k < 0:
+                    targets[i] = q
+                else:
+                    controls[i, k] = q
+                k += 1
+    return targets, controls
+
+@lru_cache(maxsize=None)
+def _static_layers(num_qubits: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Targets and controls of the Hadamard prefix and the CZ-chain suffix,
+    with control rows as wide as the rotation layout's"""
+    width = max(1, num_qubits - 1)
+    prefix_controls = np.full((num_qubits, width), -1, dtype=np.int32)
+    suffix_controls = np.full((num_qubits - 1, width), -1, dtype=np.int32)
+    suffix_controls[:, 0] = np.arange(1, num_qubits)
+    layers = (np.arange(num_qubits, dtype=np.int32), prefix_controls,
+              np.arange(num_qubits - 1, dtype=np.int32), suffix_controls)
+    for layer in layers:
+        layer.flags.writeable = False
+    return layers
+
+@lru_cache(maxsize=None)
+def _word_template(num_qubits: int, num_components: int) -> Tuple[QuantumCircuit, np.ndarray]:
+    """Gate layout of a word circuit and each gate's RY angle slot (-1 for none)"""
+    template = QuantumCircuit(num_qubits, capacity=2 * num_qubits - 1 + num_components)
+    
+    # Hadamards to create superposition, controlled rotations based on the
+    # binary representation of each component (with no active qubits the RY
+    # goes on the first qubit) and some entanglement (simplified IQP approach),
+    # written into the tables in one call
+    prefix_targets, prefix_controls, suffix_targets, suffix_controls = _static_layers(num_qubits)
+    targets, controls = _rotation_layout(num_qubits, num_components)
+    names = ["H"] * num_qubits + ["RY"] * num_components + ["CZ"] * (num_qubits - 1)
+    template.add_gates(
+        names,
+        np.concatenate((prefix_targets, targets, suffix_targets)),
+        np.concatenate((prefix_controls, controls, suffix_controls)),
+    )
+    
+    # The template is shared by every word, so keep it read-only
+    for table in (template.targets, template.controls, template.params):
+        table.flags.writeable = False
+    slots = np.full(template.num_gates, -1)
+    slots[num_qubits:num_qubits + num_components] = np.arange(num_components)
+    return template, slots
+
+def _fill_angles(template: QuantumCircuit, slots: np.ndarray, angles: np.ndarray) -> QuantumCircuit:
+    """Instantiate a circuit template with concrete rotation angles"""
+    circuit = template.copy()
+    circuit.params[:len(slots), 0] = np.where(slots >= 0, angles[slots], np.nan)
+    return circuit
 
 class QuantumSemantics:
     """Representation of meaning through quantum semantics"""
@@ -317,50 +631,20 @@ class QuantumSemantics:
     
     def word_to_circuit(self, word: str, word_type: Type) -> QuantumCircuit:
         """Create a quantum circuit for a word"""
-        # Create a circuit with enough qubits for this word
+        # Number of qubits for this word
         num_qubits = self.qubits_per_word
-        circuit = QuantumCircuit(num_qubits)
         
         # Get semantic representation
         if word not in self.semantics:
             self.semantics[word] = self.functor.map_word(word, word_type)
         
-        sem_vector = self.semantics[word]
-        if sem_vector.ndim > 1:
-            # Flatten higher-order tensors to vectors
-            sem_vector = sem_vector.reshape(-1)[:2**num_qubits]
-        
-        # Start with Hadamards to create superposition
-        for i in range(num_qubits):
-            circuit.add_gate("H", [i])
+        # Flatten higher-order tensors to vectors
+        sem_vector = np.ravel(self.semantics[word])[:2**num_qubits]
         
         # Use vector components to inform rotation angles (simplified)
-        for i in range(min(2**num_qubits, len(sem_vector))):
-            # Get binary representation of i
-            bin_i = format(i, f'0{num_qubits}b')
-            
-            # Calculate rotation angle based on vector component
-            component = sem_vector[i]
-            if np.iscomplex(component):
-                component = np.abs(component)
-            angle = np.arccos(component) if -1 <= component <= 1 else 0
-            
-            # Apply controlled rotations based on binary representation
-            active_qubits = [q for q, bit in enumerate(bin_i) if bit == '1']
-            if not active_qubits:
-                # If no active qubits, apply RY to first qubit
-                circuit.add_gate("RY", [0], params=[angle])
-            else:
-                # Use first active qubit as target, others as controls
-                target = active_qubits[0]
-                controls = active_qubits[1:] if len(active_qubits) > 1 else []
-                circuit.add_gate("RY", [target], controls=controls, params=[angle])
-        
-        # Add some entanglement (simplified IQP approach)
-        for i in range(num_qubits - 1):
-            circuit.add_gate("CZ", [i], controls=[i+1])
-        
-        return circuit
+        angles = np.arccos(np.clip(np.abs(sem_vector), -1, 1))
+        template, slots = _word_template(num_qubits, len(sem_vector))
+        return _fill_angles(template, slots, angles)
     
     def prepare_phrase_diagram(self) -> Diagram:
         """Prepare the diagram for 'someone's lot in life'"""
@@ -371,11 +655,12 @@ class QuantumSemantics:
         in_box = Box("in", Type(), in_type)
         life_box = Box("life", Type(), life_type)
         
-        # Create cups for contractions based on pregroup typing
+        # Create cups for contractions based on pregroup typing; indices are
+        # wires numbered left to right: someone(0) 's(1, 2) lot(3) in(4, 5, 6) life(7)
         cups = [
             Cup(0, 1, someone_type, s_poss_type.types[0]),  # someone ← 's
-            Cup(2, 3, lot_type, in_type.types[0]),         # lot ← in
-            Cup(5, 6, in_type.types[2], life_type)         # in → life
+            Cup(3, 4, lot_type, in_type.types[0]),         # lot ← in
+            Cup(6, 7, in_type.types[2], life_type)         # in → life
         ]
         
         # Create diagram
@@ -388,10 +673,11 @@ class QuantumSemantics:
         
         return diagram
     
-    def phrase_to_circuit(self, use_spider_ansatz: bool = False) -> QuantumCircuit:
+    def phrase_to_circuit(self, use_spider_ansatz: bool = False, diagram: Optional[Diagram] = None) -> QuantumCircuit:
         """Create a quantum circuit for the entire phrase"""
-        # Prepare the diagram
-        diagram = self.prepare_phrase_diagram()
+        # Prepare the diagram unless the caller already has one
+        if diagram is None:
+            diagram = self.prepare_phrase_diagram()
         
         # Get semantic representations for each word
         for box in diagram.boxes:
@@ -408,32 +694,24 @@ class QuantumSemantics:
         total_qubits = self.qubits_per_word * len(diagram.boxes)
         circuit = QuantumCircuit(total_qubits)
         
-        # Add word circuits
+        # Add word circuits, offsetting each one's qubits as a block
         for i, box in enumerate(diagram.boxes):
-            word_circ = word_circuits[box.name]
-            offset = i * self.qubits_per_word
-            
-            # Add gates with offset
-            for gate in word_circ.gates:
-                # Offset the target qubits
-                new_targets = [t + offset for t in gate.targets]
-                new_controls = [c + offset for c in gate.controls] if gate.controls else []
-                
-                circuit.add_gate(gate.name, new_targets, new_controls, gate.params)
+            circuit.extend(word_circuits[box.name], offset=i * self.qubits_per_word)
         
         # Add entangling gates between words based on cups
+        wire_boxes = diagram.wire_boxes()
         if use_spider_ansatz:
             # Spider ansatz uses different entanglement pattern
             for cup in diagram.cups:
                 # Connect the two words with a CZ gate
-                q1 = cup.left * self.qubits_per_word + self.qubits_per_word - 1
-                q2 = cup.right * self.qubits_per_word
+                q1 = wire_boxes[cup.left] * self.qubits_per_word + self.qubits_per_word - 1
+                q2 = wire_boxes[cup.right] * self.qubits_per_word
                 circuit.add_gate("CZ", [q1], controls=[q2])
         else:
             # IQP ansatz - use CNOT gates for cups
             for cup in diagram.cups:
-                q1 = cup.left * self.qubits_per_word + self.qubits_per_word - 1
-                q2 = cup.right * self.qubits_per_word
+                q1 = wire_boxes[cup.left] * self.qubits_per_word + self.qubits_per_word - 1
+                q2 = wire_boxes[cup.right] * self.qubits_per_word
                 circuit.add_gate("CNOT", [q2], controls=[q1])
         
         return circuit
@@ -445,36 +723,66 @@ class QuantumSemantics:
         
         # For demonstration, generate random measurement outcomes
         # with bias toward meaningful patterns
-        outcomes = defaultdict(int)
+        n = circuit.num_qubits
+        # Outcomes are int64 while they fit; wider registers are sampled as
+        # rows of bits, which have no width limit
+        wide = n >= _WIDE_REGISTER_QUBITS
         
         # Define a few dominant bitstrings with higher probability
-        dominant = ['0' * circuit.num_qubits]
-        for i in range(3):  # Add a few random dominant patterns
-            pattern = ''.join(np.random.choice(['0', '1']) for _ in range(circuit.num_qubits))
-            dominant.append(pattern)
-        
-        # Generate samples with bias toward dominant patterns
-        for _ in range(num_shots):
-            if np.random.random() < 0.7:  # 70% chance of a dominant outcome
-                bitstring = np.random.choice(dominant)
+        if wide:
+            dominant = np.zeros((4, n), dtype=np.uint8)
+            dominant[1:] = _RNG.integers(0, 2, size=(3, n), dtype=np.uint8)
+        else:
+            dominant = np.concatenate(([0], _RNG.integers(0, 2**n, size=3)))
+        
+        # Draw every shot at once: 70% chance of a dominant outcome, split
+        # evenly, and the last choice stands for a uniformly random bitstring
+        probs = np.append(np.full(len(dominant), 0.7 / len(dominant)), 0.3)
+        choice = _RNG.choice(len(dominant) + 1, size=num_shots, p=probs)
+        is_dominant = choice < len(dominant)
+        num_uniform = num_shots - int(is_dominant.sum())
+        
+        if wide:
+            samples = np.empty((num_shots, n), dtype=np.uint8)
+            samples[is_dominant] = dominant[choice[is_dominant]]
+            samples[~is_dominant] = _RNG.integers(0, 2, size=(num_uniform, n), dtype=np.uint8)
+            bits, counts = np.unique(samples, axis=0, return_counts=True)
+        else:
+            samples = np.empty(num_shots, dtype=np.int64)
+            samples[is_dominant] = dominant[choice[is_dominant]]
+            samples[~is_dominant] = _RNG.integers(0, 2**n, size=num_uniform)
+            
+            # Count by integer outcome and only format the outcomes that
+            # occurred; a dense histogram only pays off while 2^n is small
+            # next to the shots
+            if 2**n <= 4 * num_shots:
+                counts = np.bincount(samples, minlength=2**n)
+                observed = np.flatnonzero(counts)
+                counts = counts[observed]
             else:
-                bitstring = ''.join(np.random.choice(['0', '1']) for _ in range(circuit.num_qubits))
-            outcomes[bitstring] += 1
+                observed, counts = np.unique(samples, return_counts=True)
+            bits = (observed[:, None] >> np.arange(n - 1, -1, -1)) & 1
         
-        return outcomes
+        # Spell out all observed outcomes at once as ASCII digit bytes, most
+        # significant bit first, then cut the text into n-character keys
+        text = (bits.astype(np.uint8) + ord('0')).tobytes().decode('ascii')
+        bitstrings = [text[i:i + n] for i in range(0, len(text), n)]
+        return dict(zip(bitstrings, counts.tolist()))
     
-    def interpret_measurements(self, outcomes: Dict[str, int], num_shots: int) -> Dict:
+    def interpret_measurements(self, outcomes: Dict[str, int], num_shots: int, top_k: int = 5) -> Dict:
         """Interpret measurement outcomes semantically"""
-        # Sort outcomes by frequency
-        sorted_outcomes = sorted(outcomes.items(), key=lambda x: x[1], reverse=True)
-        
-        # Calculate probabilities
-        probabilities = {bitstr: count / num_shots for bitstr, count in sorted_outcomes}
+        # Sort outcomes by frequency, as a probability array and the matching
+        # bitstrings rather than a rebuilt dict
+        bitstrings = list(outcomes)
+        counts = np.fromiter(outcomes.values(), dtype=np.int64, count=len(bitstrings))
+        order = np.argsort(-counts, kind='stable')
+        probabilities = (counts[order] / num_shots, [bitstrings[i] for i in order.tolist()])
         
         # Interpret top outcomes (simplified)
+        top_outcomes = [(bitstrings[i], int(counts[i])) for i in order[:top_k].tolist()]
         interpretations = {
             bitstr: f"Semantic component {i+1}" 
-            for i, (bitstr, _) in enumerate(sorted_outcomes[:5])
+            for i, (bitstr, _) in enumerate(top_outcomes)
         }
         
         # Overall interpretation
@@ -482,6 +790,7 @@ class QuantumSemantics:
         
         return {
             "probabilities": probabilities,
+            "top_outcomes": top_outcomes,
             "interpretations": interpretations,
             "normalized_meaning": normalized_meaning
         }
@@ -505,23 +814,22 @@ class QuantumSemantics:
         # Create quantum circuit
         print("\n=== Quantum Circuit Translation ===")
         print(f"Using {'Spider' if use_spider_ansatz else 'IQP'} ansatz")
-        circuit = self.phrase_to_circuit(use_spider_ansatz)
-        print(f"Circuit with {circuit.num_qubits} qubits and {len(circuit.gates)} gates")
+        circuit = self.phrase_to_circuit(use_spider_ansatz, diagram)
+        print(f"Circuit with {circuit.num_qubits} qubits and {circuit.num_gates} gates")
         
         # Simulate measurements
         print("\n=== Quantum Simulation and Measurement ===")
         outcomes = self.simulate_circuit(circuit, num_shots)
         print(f"Simulated {num_shots} shots")
         
-        # Top 5 most common outcomes
-        top_outcomes = sorted(outcomes.items(), key=lambda x: x[1], reverse=True)[:5]
+        # Top 5 most common outcomes, ranked once by the interpretation
+        interpretation = self.interpret_measurements(outcomes, num_shots)
         print("Top outcomes:")
-        for bitstr, count in top_outcomes:
+        for bitstr, count in interpretation["top_outcomes"]:
             print(f"  {bitstr}: {count} shots ({count/num_shots:.2%})")
         
         # Interpretation
         print("\n=== Semantic Interpretation and Normalization ===")
-        interpretation = self.interpret_measurements(outcomes, num_shots)
         print(interpretation["normalized_meaning"])
         
         return {